@@ -343,8 +343,11 @@ async def lifespan(app: FastAPI):
         ms.log_buffer.append("🧪 UI TEST MODE - Showing sample transfers for development")
         ms.log_buffer.append("ℹ Set UI_TEST_MODE=0 or remove env var to use real MEGAcmd")
 
-    server_ready = await ms.ensure_mega_cmd_server_running()
-    os.makedirs(ms.DOWNLOAD_DIR, exist_ok=True)
+    # Create the download dir in a worker thread while MEGAcmd starts; slow on network-mounted homes.
+    server_ready, _ = await asyncio.gather(
+        ms.ensure_mega_cmd_server_running(),
+        asyncio.to_thread(os.makedirs, ms.DOWNLOAD_DIR, exist_ok=True),
+    )
 
     if not server_ready and not ms.in_docker() and sys.platform == "darwin" and not ms.UI_TEST_MODE:
         ms.log_buffer.append("⚠ MEGAcmd server not detected. Open MEGAcmd from Applications, then restart this app.")
@@ -366,6 +369,8 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    ms.flush_pending_history()
+
 
 app = FastAPI(lifespan=lifespan, title="FileTugger API")
 app.include_router(diagnostics_router)
@@ -543,6 +548,7 @@ async def api_secrets_set(body: SecretSetBody, request: Request, _: None = Depen
         # Update environment if it matches known MEGA keys
         if body.key in ("MEGA_EMAIL", "MEGA_PASSWORD"):
             os.environ[body.key] = body.value
+            ms.clear_subprocess_env_cache()
         ms.log_buffer.append(f"Secret '{body.key}' updated.")
         return {"success": True, "message": f"Secret '{body.key}' saved."}
     except Exception as e:
@@ -190,7 +190,7 @@ async def _resolve_and_validate_url(url: str, timeout: float = 10.0) -> tuple[st
 
 
 def _download_dir_realpath() -> str:
-    return os.path.realpath(os.path.abspath(ms.DOWNLOAD_DIR))
+    return os.path.realpath(ms.download_dir_abs())
 
 
 def _is_under_download_dir(path: str) -> bool:
@@ -493,7 +493,7 @@ async def _run_job_inner(job: HttpJob, pending_id: str | None) -> None:
         *argv,
         stdout=asyncio.subprocess.DEVNULL,
         stderr=asyncio.subprocess.PIPE,
-        env=ms.subprocess_env(),
+        env=ms.spawn_env(),
     )
     job.proc = proc
     job.stderr_task = asyncio.create_task(_stderr_consumer(job))
@@ -6,30 +6,135 @@ transfer list parsing, download/actions, URL history, and in-memory logs.
 from __future__ import annotations
 
 import asyncio
+import atexit
+import contextlib
 import json
 import os
+import queue
 import re
 import shutil
+import subprocess
 import sys
 import threading
 import time
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 from urllib.parse import urlparse
 
 import crypt_utils
 import pending_correlation
 import transfer_metadata as tm
+from services.json_store import write_json_atomic
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used when it is not installed
+    orjson = None
+
+
+def _json_line(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, ensure_ascii=False).encode() + b"\n"
+
+
+def _json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 
 # #region agent log
 DEBUG_LOG_PATH = os.environ.get(
     "MEGA_DEBUG_LOG_PATH",
     str(Path(__file__).resolve().parent / ".mega-debug.log"),
 )
+# Read once at import: when off, _debug_log is a no-op and hot callsites skip building their payloads.
+_DEBUG_LOG_ENABLED = os.environ.get("MEGA_DEBUG_LOG", "").strip().lower() in ("1", "true", "yes")
 
+_DEBUG_LOG_BATCH_MAX = 128
+_DEBUG_LOG_FLUSH_SEC = 0.05
+_debug_log_queue: queue.SimpleQueue[dict[str, Any] | None] = queue.SimpleQueue()
+_debug_log_writer: threading.Thread | None = None
+_debug_log_writer_lock = threading.Lock()
+_debug_log_atexit_registered = False
 
-def _debug_log(location: str, message: str, data: dict | None = None, hypothesis_id: str = "") -> None:
+
+def _debug_log_line(payload: dict[str, Any]) -> bytes:
+    try:
+        return _json_line(payload)
+    except Exception:
+        return b""
+
+
+def _debug_log_writer_loop() -> None:
+    """Serialize queued debug records into one long-lived handle, flushing per batch (≤128 records or 50ms)."""
+    f = None
+    stop = False
+    while not stop:
+        batch = [_debug_log_queue.get()]
+        deadline = time.monotonic() + _DEBUG_LOG_FLUSH_SEC
+        while len(batch) < _DEBUG_LOG_BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_debug_log_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        if None in batch:
+            stop = True
+        try:
+            if f is None:
+                Path(DEBUG_LOG_PATH).parent.mkdir(parents=True, exist_ok=True)
+                f = open(DEBUG_LOG_PATH, "ab", buffering=64 * 1024)
+            # Serialization happens here, so callers on the event loop only pay for a queue put.
+            f.writelines(_debug_log_line(payload) for payload in batch if payload is not None)
+            f.flush()
+        except Exception:
+            # Drop the broken handle (closing it may fail too); the next batch reopens the file.
+            if f is not None:
+                with contextlib.suppress(Exception):
+                    f.close()
+            f = None
+    if f is not None:
+        with contextlib.suppress(Exception):
+            f.close()
+
+
+def _ensure_debug_log_writer() -> None:
+    global _debug_log_writer, _debug_log_atexit_registered
+    writer = _debug_log_writer
+    if writer is not None and writer.is_alive():
+        return
+    with _debug_log_writer_lock:
+        writer = _debug_log_writer
+        if writer is None or not writer.is_alive():
+            _debug_log_writer = threading.Thread(
+                target=_debug_log_writer_loop, name="mega-debug-log-writer", daemon=True
+            )
+            _debug_log_writer.start()
+            if not _debug_log_atexit_registered:
+                atexit.register(_stop_debug_log_writer)
+                _debug_log_atexit_registered = True
+
+
+def _stop_debug_log_writer(timeout: float = 1.0) -> None:
+    """Let the writer drain what is queued, then close the file (registered with atexit)."""
+    global _debug_log_writer
+    writer = _debug_log_writer
+    if writer is None:
+        return
+    _debug_log_queue.put_nowait(None)
+    writer.join(timeout)
+    # A writer still draining after the timeout keeps its handle, so no second writer opens the same file.
+    if not writer.is_alive():
+        _debug_log_writer = None
+
+
+def _debug_log_write(location: str, message: str, data: dict | None = None, hypothesis_id: str = "") -> None:
     try:
         payload = {
             "sessionId": "debug-session",
@@ -40,16 +145,40 @@ def _debug_log(location: str, message: str, data: dict | None = None, hypothesis
             "data": data or {},
             "timestamp": int(time.time() * 1000),
         }
-        Path(DEBUG_LOG_PATH).parent.mkdir(parents=True, exist_ok=True)
-        with open(DEBUG_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        _ensure_debug_log_writer()
+        _debug_log_queue.put_nowait(payload)
     except Exception:
         pass
 
 
+def _debug_log_disabled(location: str, message: str, data: dict | None = None, hypothesis_id: str = "") -> None:
+    return None
+
+
+_debug_log = _debug_log_write if _DEBUG_LOG_ENABLED else _debug_log_disabled
+
+
 # #endregion
 
 
+# Copy of os.environ (plus MEGACMD_PATH) shared by every MEGAcmd spawn; rebuilt after env changes.
+_subprocess_env_cache: Mapping[str, str] | None = None
+_subprocess_env_cache_path: str | None = None
+
+
+def clear_subprocess_env_cache() -> None:
+    global _subprocess_env_cache, _subprocess_env_cache_path
+    _subprocess_env_cache = None
+    _subprocess_env_cache_path = None
+    _which_cached.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def _which_cached(binary: str, path_str: str) -> str | None:
+    """shutil.which memoized per (binary, PATH); cleared together with the subprocess env cache."""
+    return shutil.which(binary, path=path_str)
+
+
 def load_secrets_into_env() -> None:
     """Load encrypted secrets into environment variables."""
     try:
@@ -59,9 +188,12 @@ def load_secrets_into_env() -> None:
                 os.environ[item_name] = item_value
     except Exception:
         pass
+    clear_subprocess_env_cache()
 
 
+@lru_cache(maxsize=1)
 def in_docker() -> bool:
+    """Probed once: the container marker cannot appear or vanish while the process runs."""
     return os.path.exists("/.dockerenv") or bool(os.environ.get("container"))
 
 
@@ -82,12 +214,21 @@ def default_history_path() -> str:
     return os.path.join(app_root_dir(), ".mega-get-history.json")
 
 
+@lru_cache(maxsize=8)
+def _abspath_cached(path: str) -> str:
+    return os.path.abspath(path)
+
+
+def download_dir_abs() -> str:
+    """Absolute DOWNLOAD_DIR, memoized per value (the app never changes its working directory)."""
+    return _abspath_cached(DOWNLOAD_DIR)
+
+
 load_secrets_into_env()
 
 DOWNLOAD_DIR = os.environ.get("DOWNLOAD_DIR") or default_download_dir()
 TRANSFER_LIST_LIMIT = os.environ.get("TRANSFER_LIST_LIMIT", "50")
 PATH_DISPLAY_SIZE = os.environ.get("PATH_DISPLAY_SIZE", "80")
-INPUT_TIMEOUT = float(os.environ.get("INPUT_TIMEOUT", "0.0166"))
 SIMULATE = os.environ.get("MEGA_SIMULATE", "").strip().lower() in ("1", "true", "yes")
 UI_TEST_MODE = os.environ.get("UI_TEST_MODE", "").strip().lower() in ("1", "true", "yes")
 
@@ -97,22 +238,35 @@ if not MEGACMD_PATH and sys.platform == "darwin":
     if os.path.isdir(_macos_path):
         MEGACMD_PATH = _macos_path
 
-POLL_INTERVAL = max(INPUT_TIMEOUT, 0.5)
+# Transfer-list cadence of the archived Flet UI's poller.
+POLL_INTERVAL = max(float(os.environ.get("POLL_INTERVAL", "1.5")), 0.5)
+# Pollers back off towards this while the transfer list stays unchanged.
+POLL_INTERVAL_MAX = 10.0
 URL_HISTORY_MAX = 50
-LOG_MAX_LINES = 500
+LOG_MAX_LINES = max(int(os.environ.get("LOG_MAX_LINES", "500")), 1)
 
 # Cache for mega-transfers output to avoid redundant subprocess spawns
 # when multiple endpoints (transfers, analytics) poll simultaneously.
 _transfer_list_cache: str | None = None
 _transfer_list_cache_time: float = 0
 _TRANSFER_LIST_CACHE_TTL = 0.8  # 800ms cache to cover concurrent API polls
+_TRANSFER_LIST_TIMEOUT_SEC = 10.0
+# mega-transfers run currently in flight; callers that miss the cache meanwhile await it instead of spawning.
+_transfer_list_inflight: asyncio.Future[str] | None = None
+_transfer_list_generation = 0
+# Raw bytes of the last mega-transfers run and their decoded text; idle polls skip the decode.
+_transfer_output_raw: tuple[bytes, bytes] | None = None
+_transfer_output_text = ""
 CMD_HISTORY_MAX = 100
 
 
 def clear_transfer_list_cache() -> None:
-    global _transfer_list_cache, _transfer_list_cache_time
+    global _transfer_list_cache, _transfer_list_cache_time, _transfer_list_inflight, _transfer_list_generation
     _transfer_list_cache = None
     _transfer_list_cache_time = 0
+    # A run already in flight may predate the change: later callers start a fresh one and it won't be cached.
+    _transfer_list_inflight = None
+    _transfer_list_generation += 1
 
 
 _log_notify: Callable[[], None] | None = None
@@ -125,33 +279,77 @@ def set_log_notify(fn: Callable[[], None] | None) -> None:
 
 class LogBuffer:
     def __init__(self, max_lines: int = LOG_MAX_LINES) -> None:
-        self._max = max_lines
-        self._lines: list[str] = []
+        self._lines: deque[str] = deque(maxlen=max_lines)
+        self._text: str | None = None
+        self._last: str | None = None
+        self._dup_count = 0
         self._lock = threading.Lock()
 
     def append(self, line: str) -> None:
-        redacted = redact_sensitive_text(line)
+        """Append a redacted line; identical consecutive lines collapse into one entry suffixed "(×N)"."""
+        self.extend((line,))
+
+    def extend(self, lines: Iterable[str]) -> None:
+        """Append several lines under one lock acquisition and a single change notification."""
+        redacted_lines = [redact_sensitive_text(line) for line in lines]
+        if not redacted_lines:
+            return
         with self._lock:
-            self._lines.append(redacted)
-            if len(self._lines) > self._max:
-                self._lines = self._lines[-self._max :]
+            for redacted in redacted_lines:
+                self._add_locked(redacted)
         if _log_notify:
             try:
                 _log_notify()
             except Exception:
                 pass
 
+    def _add_locked(self, redacted: str) -> None:
+        # The cached text is patched in step with the deque (rewrite the last line, drop the evicted first
+        # line, append), so a full buffer does not force a re-join of every line on the next read.
+        text = self._text
+        if self._lines and redacted == self._last:
+            self._dup_count += 1
+            old_entry = self._lines[-1]
+            entry = f"{redacted} (×{self._dup_count})"
+            self._lines[-1] = entry
+            if text is not None:
+                self._text = text[: len(text) - len(old_entry)] + entry
+            return
+        self._last = redacted
+        self._dup_count = 1
+        evicted = self._lines[0] if len(self._lines) == self._lines.maxlen else None
+        self._lines.append(redacted)
+        if text is None:
+            return
+        if len(self._lines) == 1:
+            self._text = redacted
+        elif evicted is not None:
+            self._text = f"{text[len(evicted) + 1 :]}\n{redacted}"
+        else:
+            self._text = f"{text}\n{redacted}"
+
     def get_lines(self) -> list[str]:
         with self._lock:
             return list(self._lines)
 
+    def get_text(self) -> str:
+        """Newline-joined log; appends patch the cached text, only the first read after a clear joins."""
+        with self._lock:
+            if self._text is None:
+                self._text = "\n".join(self._lines)
+            return self._text
+
     def clear(self) -> None:
         with self._lock:
             self._lines.clear()
+            self._text = None
+            self._last = None
+            self._dup_count = 0
 
 
 log_buffer = LogBuffer()
-_command_events: list[dict[str, Any]] = []
+# Bounded like the log buffer: the oldest command events fall off without list shifting.
+_command_events: deque[dict[str, Any]] = deque(maxlen=CMD_HISTORY_MAX)
 
 # Serialize queue-driven (and UI) mega-get correlation windows so tag snapshots stay unambiguous.
 queue_dispatch_semaphore = asyncio.Semaphore(1)
@@ -175,8 +373,6 @@ def validate_mega_download_url(url: str) -> str:
 
 def _record_command_event(event: dict[str, Any]) -> None:
     _command_events.append(event)
-    if len(_command_events) > CMD_HISTORY_MAX:
-        del _command_events[:-CMD_HISTORY_MAX]
 
 
 def get_command_events() -> list[dict[str, Any]]:
@@ -314,6 +510,15 @@ def redact_command_args(args: list[str]) -> list[str]:
 # URL history (newest first)
 _url_history: list[str] = []
 _history_file_path: str | None = None
+_HISTORY_SAVE_DELAY_SEC = 0.5
+_history_save_handle: asyncio.TimerHandle | None = None
+_history_save_loop: asyncio.AbstractEventLoop | None = None
+# (path, mtime_ns, size) of the history file as last read or written by this process.
+_history_file_stat: tuple[str, int, int] | None = None
+# Snapshots are numbered so an executor write can never overwrite a newer one.
+_history_seq = 0
+_history_written_seq = 0
+_history_write_lock = threading.Lock()
 
 
 def set_history_path(path: str | None) -> None:
@@ -325,27 +530,85 @@ def get_history_path() -> str:
     return _history_file_path or default_history_path()
 
 
+def _history_stat_key(path: str) -> tuple[str, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return path, st.st_mtime_ns, st.st_size
+
+
 def load_history() -> None:
-    global _url_history
+    """Load history from disk; skipped when the file is unchanged since the last load or flush."""
+    global _url_history, _history_file_stat
     path = get_history_path()
-    if not os.path.isfile(path):
+    key = _history_stat_key(path)
+    if key is None or key == _history_file_stat:
         return
     try:
-        with open(path, encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = _json_loads(f.read())
         if isinstance(data, list):
             _url_history = [u for u in data if isinstance(u, str)][:URL_HISTORY_MAX]
+        _history_file_stat = key
     except Exception:
         pass
 
 
+def _write_history_snapshot(path: str, urls: list[str], seq: int) -> None:
+    """Atomically write one history snapshot; a snapshot older than the last one written is dropped."""
+    global _history_file_stat, _history_written_seq
+    with _history_write_lock:
+        if seq < _history_written_seq:
+            return
+        try:
+            write_json_atomic(Path(path), urls)
+            _history_written_seq = seq
+            _history_file_stat = _history_stat_key(path)
+        except Exception:
+            pass
+
+
+def _history_snapshot() -> tuple[str, list[str], int]:
+    global _history_seq, _history_save_handle, _history_save_loop
+    if _history_save_handle is not None:
+        _history_save_handle.cancel()
+    _history_save_handle = None
+    _history_save_loop = None
+    _history_seq += 1
+    return get_history_path(), _url_history[:URL_HISTORY_MAX], _history_seq
+
+
+def flush_history() -> None:
+    """Write history now (atomic replace), cancelling any pending deferred save."""
+    _write_history_snapshot(*_history_snapshot())
+
+
+def flush_pending_history() -> None:
+    """Write history now only if a deferred save is still pending (shutdown); otherwise leave the file alone."""
+    if _history_save_handle is not None:
+        flush_history()
+
+
+def _flush_history_off_loop() -> None:
+    # Snapshot on the loop thread; serialization and file I/O run in the default executor.
+    asyncio.get_running_loop().run_in_executor(None, _write_history_snapshot, *_history_snapshot())
+
+
 def save_history() -> None:
-    path = get_history_path()
+    """Persist history; inside a running event loop, bursts of changes collapse into one deferred write."""
+    global _history_save_handle, _history_save_loop
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(_url_history[:URL_HISTORY_MAX], f, ensure_ascii=False)
-    except Exception:
-        pass
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        flush_history()
+        return
+    if _history_save_handle is not None and _history_save_loop is loop:
+        return
+    if _history_save_handle is not None:
+        _history_save_handle.cancel()
+    _history_save_loop = loop
+    _history_save_handle = loop.call_later(_HISTORY_SAVE_DELAY_SEC, _flush_history_off_loop)
 
 
 def get_history() -> list[str]:
@@ -368,11 +631,22 @@ def clear_history() -> None:
     save_history()
 
 
-def subprocess_env() -> dict[str, str]:
-    env = os.environ.copy()
-    if MEGACMD_PATH:
-        env["PATH"] = os.pathsep.join([MEGACMD_PATH, env.get("PATH", "")])
-    return env
+def subprocess_env() -> Mapping[str, str]:
+    """Shared, read-only environment for MEGAcmd subprocesses (built once per MEGACMD_PATH / secrets change)."""
+    global _subprocess_env_cache, _subprocess_env_cache_path
+    if _subprocess_env_cache is None or _subprocess_env_cache_path != MEGACMD_PATH:
+        env = os.environ.copy()
+        if MEGACMD_PATH:
+            env["PATH"] = os.pathsep.join([MEGACMD_PATH, env.get("PATH", "")])
+        _which_cached.cache_clear()
+        _subprocess_env_cache = MappingProxyType(env)
+        _subprocess_env_cache_path = MEGACMD_PATH
+    return _subprocess_env_cache
+
+
+def spawn_env() -> Mapping[str, str] | None:
+    """``env=`` for MEGAcmd spawns: None (inherit, no per-spawn envp build) unless MEGACMD_PATH is prepended."""
+    return subprocess_env() if MEGACMD_PATH else None
 
 
 def mega_cmd_server_binary() -> str | None:
@@ -380,7 +654,7 @@ def mega_cmd_server_binary() -> str | None:
     path_str = env.get("PATH", "")
     if not path_str:
         return None
-    if shutil.which("mega-cmd-server", path=path_str):
+    if _which_cached("mega-cmd-server", path_str):
         return "mega-cmd-server"
     if sys.platform == "darwin" and MEGACMD_PATH:
         mac_cmd = os.path.join(MEGACMD_PATH, "MEGAcmd")
@@ -389,10 +663,40 @@ def mega_cmd_server_binary() -> str | None:
     return None
 
 
+def _mega_socket_paths() -> list[str]:
+    """Unix sockets a local MEGAcmd server listens on (current builds, then the legacy per-uid /tmp path)."""
+    if not hasattr(os, "getuid"):
+        return []
+    return [os.path.expanduser("~/.megaCmd/megacmd.socket"), f"/tmp/megaCMD_{os.getuid()}/srv"]
+
+
+async def _probe_mega_socket() -> bool:
+    """True when a MEGAcmd server socket accepts a connection; far cheaper than spawning a CLI client."""
+    for path in _mega_socket_paths():
+        if not os.path.exists(path):
+            continue
+        try:
+            _reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(path), timeout=1.0)
+        except (TimeoutError, OSError):
+            continue
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+    return False
+
+
 async def wait_for_mega_server_ready(max_wait_sec: float = 15.0) -> bool:
-    env = subprocess_env()
+    env = spawn_env()
     deadline = asyncio.get_event_loop().time() + max_wait_sec
+    # Back off 0.1s, 0.2s, 0.4s... (capped at 2s) so an already-running server is seen almost immediately.
+    delay = 0.1
     while asyncio.get_event_loop().time() < deadline:
+        if await _probe_mega_socket():
+            return True
+        # No reachable socket: mega-version also starts the server when it is not running yet.
         try:
             proc = await asyncio.create_subprocess_exec(
                 "mega-version",
@@ -405,7 +709,8 @@ async def wait_for_mega_server_ready(max_wait_sec: float = 15.0) -> bool:
                 return True
         except (TimeoutError, OSError):
             pass
-        await asyncio.sleep(1.0)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 2.0)
     return False
 
 
@@ -413,7 +718,7 @@ async def ensure_mega_cmd_server_running() -> bool:
     if in_docker() or SIMULATE:
         return True
     server_bin = mega_cmd_server_binary()
-    env = subprocess_env()
+    env = spawn_env()
     if server_bin == "mega-cmd-server":
         try:
             await asyncio.create_subprocess_exec(
@@ -452,9 +757,8 @@ def _get_test_transfer_output() -> str:
 
 
 async def get_transfer_list() -> str:
-    global _transfer_list_cache, _transfer_list_cache_time
-    now = time.monotonic()
-    if _transfer_list_cache is not None and (now - _transfer_list_cache_time) < _TRANSFER_LIST_CACHE_TTL:
+    global _transfer_list_inflight
+    if _transfer_list_cache is not None and (time.monotonic() - _transfer_list_cache_time) < _TRANSFER_LIST_CACHE_TTL:
         return _transfer_list_cache
 
     if SIMULATE:
@@ -467,52 +771,107 @@ async def get_transfer_list() -> str:
     if UI_TEST_MODE:
         return _get_test_transfer_output()
 
-    _debug_log(
-        "mega_service:get_transfer_list",
-        "calling mega-transfers",
-        {"limit": TRANSFER_LIST_LIMIT, "path_display_size": PATH_DISPLAY_SIZE},
-        hypothesis_id="H5",
-    )
+    task = _transfer_list_inflight
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch_transfer_list())
+        _transfer_list_inflight = task
+        task.add_done_callback(_clear_transfer_list_inflight)
+    return await asyncio.shield(task)
 
-    proc = await asyncio.create_subprocess_exec(
-        "mega-transfers",
-        f"--limit={TRANSFER_LIST_LIMIT}",
-        f"--path-display-size={PATH_DISPLAY_SIZE}",
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        env=subprocess_env(),
-    )
-    stdout, stderr = await proc.communicate()
-    out_s = (stdout or b"").decode(errors="replace")
-    err_s = (stderr or b"").decode(errors="replace")
+
+def _clear_transfer_list_inflight(task: asyncio.Future[str]) -> None:
+    global _transfer_list_inflight
+    if _transfer_list_inflight is task:
+        _transfer_list_inflight = None
+
+
+def _decode_transfer_output(stdout: bytes, stderr: bytes) -> str:
+    """Decode and merge mega-transfers output; byte-identical output returns the previous string object."""
+    global _transfer_output_raw, _transfer_output_text
+    if _transfer_output_raw == (stdout, stderr):
+        return _transfer_output_text
+    out_s = stdout.decode(errors="replace")
+    err_s = stderr.decode(errors="replace")
     # Some builds write the table to stderr or only populate stderr; merge for parsing.
-    if not out_s.strip():
+    # isspace() answers "blank?" without the copy strip() would make of a multi-KB table.
+    if not out_s or out_s.isspace():
         out = err_s
+    elif err_s and not err_s.isspace():
+        out = "\n".join((out_s.rstrip(), err_s))
     else:
         out = out_s
-        if err_s.strip():
-            out = out_s.rstrip() + "\n" + err_s
-
-    _debug_log(
-        "mega_service:get_transfer_list",
-        "mega-transfers output",
-        {
-            "returncode": proc.returncode,
-            "stderr_present": bool(stderr and len(stderr) > 0),
-            "stderr_preview": (stderr or b"").decode(errors="replace")[:300].strip() if stderr else "",
-            "stdout_len": len(out),
-            "stdout_full": out,
-        },
-        hypothesis_id="H5",
-    )
-    _transfer_list_cache = out
-    _transfer_list_cache_time = now
+    _transfer_output_raw = (stdout, stderr)
+    _transfer_output_text = out
+    return out
+
+
+async def _fetch_transfer_list() -> str:
+    global _transfer_list_cache, _transfer_list_cache_time
+    now = time.monotonic()
+    generation = _transfer_list_generation
+    if _DEBUG_LOG_ENABLED:
+        _debug_log(
+            "mega_service:get_transfer_list",
+            "calling mega-transfers",
+            {"limit": TRANSFER_LIST_LIMIT, "path_display_size": PATH_DISPLAY_SIZE},
+            hypothesis_id="H5",
+        )
+
+    # Small, fully buffered output: a blocking run in a worker thread avoids per-poll asyncio pipe transports.
+    try:
+        proc = await asyncio.to_thread(
+            subprocess.run,
+            ["mega-transfers", f"--limit={TRANSFER_LIST_LIMIT}", f"--path-display-size={PATH_DISPLAY_SIZE}"],
+            capture_output=True,
+            env=spawn_env(),
+            bufsize=-1,
+            timeout=_TRANSFER_LIST_TIMEOUT_SEC,
+        )
+    except subprocess.TimeoutExpired:
+        # MEGAcmd can stall for a while (login, fetchnodes): report the last known table, but do not cache it.
+        log_buffer.append(
+            f"mega-transfers did not answer within {_TRANSFER_LIST_TIMEOUT_SEC:g}s; showing last known list"
+        )
+        return _transfer_output_text
+    stdout, stderr = proc.stdout or b"", proc.stderr or b""
+    out = _decode_transfer_output(stdout, stderr)
+
+    if _DEBUG_LOG_ENABLED:
+        _debug_log(
+            "mega_service:get_transfer_list",
+            "mega-transfers output",
+            {
+                "returncode": proc.returncode,
+                "stderr_present": bool(stderr and len(stderr) > 0),
+                "stderr_preview": stderr[:300].decode(errors="replace").strip() if stderr else "",
+                "stdout_len": len(out),
+                "stdout_full": out,
+            },
+            hypothesis_id="H5",
+        )
+    if generation == _transfer_list_generation:
+        _transfer_list_cache = out
+        _transfer_list_cache_time = now
     return out
 
 
 # Unicode + ASCII arrows seen in different MEGAcmd / terminal renderings
 _TRANSFER_ARROW_CLASS = r"[⇓↑↓v^]"
 
+# First token of MEGAcmd / simulated table headers; data rows start with an arrow, a tag or DOWNLOAD/UPLOAD.
+_TRANSFER_HEADER_TOKENS = frozenset({"TYPE", "TAG", "TRANSFER", "STATE", "PROGRESS", "PATH"})
+# One pass per line. Alternatives, in priority order:
+# - simulated table: tag, state, integer percent, path;
+# - MEGAcmd arrow row: direction, tag, path, percent, optional "of <size>" (absent on some builds or
+#   truncated paths), state;
+# - table-style row with a DOWNLOAD/UPLOAD keyword instead of an arrow.
+_TRANSFER_LINE_RE = re.compile(
+    r"^\s*(?P<sim_tag>\d+)\s+(?P<sim_state>\w+)\s+(?P<sim_pct>\d+)%\s+(?P<sim_path>.+)$"
+    rf"|{_TRANSFER_ARROW_CLASS}\s+(?P<tag>\d+)\s+(?P<path>.*?)\s+(?P<pct>\d+(?:\.\d+)?)\s*%\s+"
+    r"(?:of\s+(?P<size_val>[\d.]+)\s*(?P<size_unit>[KMGT]?B)\s+)?(?P<state>\w+)\s*$"
+    r"|^\s*(?i:download|upload)\s+(?P<dl_tag>\d+)\s+(?P<dl_state>\w+)\s+(?P<dl_pct>\d+(?:\.\d+)?)%\s+(?P<dl_path>.+)$"
+)
+
 
 def summarize_transfer_parse(raw: str, parsed: list[dict[str, Any]]) -> dict[str, Any]:
     """Lightweight stats for API debug (e.g. MEGA_ANALYTICS_PARSE_DEBUG=1)."""
@@ -525,147 +884,113 @@ def summarize_transfer_parse(raw: str, parsed: list[dict[str, Any]]) -> dict[str
     }
 
 
+_MAX_FN = 60
+_FN_TRUNC = 57
+
+
+def _extract_filename(path: str) -> str:
+    """Last path component, shortened to ``_MAX_FN`` characters for display.
+
+    MEGAcmd elides long paths as ``.../tail``; the last ``/`` always sits after the ellipsis, so no special case.
+    """
+    filename = path.rpartition("/")[2].strip()
+    if len(filename) > _MAX_FN:
+        filename = filename[:_FN_TRUNC] + "..."
+    return filename
+
+
+_parse_memo: tuple[str, list[dict[str, Any]]] | None = None
+
+
 def parse_transfer_list(raw: str) -> list[dict[str, Any]]:
+    """Parse mega-transfers output; a repeat of the last output (idle polls) reuses its rows."""
+    global _parse_memo
     result: list[dict[str, Any]] = []
     if not raw or not raw.strip():
         return result
+    memo = _parse_memo
+    if memo is not None and memo[0] == raw:
+        return [dict(t) for t in memo[1]]
+
+    if _DEBUG_LOG_ENABLED:
+        _debug_log(
+            "mega_service:parse_transfer_list",
+            "parsing transfer output",
+            {"raw_length": len(raw), "raw_preview": raw[:500]},
+            hypothesis_id="H6",
+        )
 
-    _debug_log(
-        "mega_service:parse_transfer_list",
-        "parsing transfer output",
-        {"raw_length": len(raw), "raw_preview": raw[:500]},
-        hypothesis_id="H6",
-    )
-
-    lines = raw.strip().split("\n")
+    lines = raw.strip().splitlines()
     for line_num, line in enumerate(lines):
         line = line.strip()
         if not line:
             continue
 
-        # Only skip a clear MEGAcmd table header, not random paths containing words like STATE.
-        if re.search(r"^\s*TYPE\s+.*\bTAG\b.*\bSTATE\b", line, re.IGNORECASE):
+        # Only skip a clear table header (keyed on its first column), not paths containing words like STATE.
+        if line.split(None, 1)[0].upper() in _TRANSFER_HEADER_TOKENS:
+            continue
+
+        m = _TRANSFER_LINE_RE.search(line)
+        if m is None:
+            if _DEBUG_LOG_ENABLED and len(line) > 10:
+                _debug_log(
+                    "mega_service:parse_transfer_list",
+                    "unparsed line",
+                    {"line_num": line_num, "line": line[:200]},
+                    hypothesis_id="H6",
+                )
             continue
 
-        sim_match = re.match(r"^\s*(\d+)\s+(\w+)\s+(\d+)%\s+(.+)$", line)
-        if sim_match:
-            tag, state, pct, path = sim_match.groups()
-            filename = path.split("/")[-1] if "/" in path else path
+        if m["sim_tag"] is not None:
+            path = m["sim_path"]
+            filename = path.rpartition("/")[2]
             result.append(
                 {
-                    "tag": tag,
-                    "progress_pct": float(pct),
-                    "state": str(state).upper(),
+                    "tag": m["sim_tag"],
+                    "progress_pct": float(m["sim_pct"]),
+                    "state": m["sim_state"].upper(),
                     "path": path.strip(),
                     "filename": filename,
                     "size_display": "Unknown",
                 }
             )
-            continue
-
-        real_match = re.search(
-            rf"({_TRANSFER_ARROW_CLASS})\s+(\d+)\s+(.*?)\s+(\d+(?:\.\d+)?)\s*%\s+of\s+([\d.]+)\s*([KMGT]?B)\s+(\w+)\s*$",
-            line,
-        )
-
-        if real_match:
-            _direction, tag, path_part, pct, size_val, size_unit, state = real_match.groups()
-            path_part = path_part.strip()
-            filename = path_part.split("/")[-1].strip() if "/" in path_part else path_part
-            if "..." in path_part and "/" in path_part:
-                parts = path_part.split("...")
-                if len(parts) > 1 and "/" in parts[-1]:
-                    filename = parts[-1].split("/")[-1].strip()
-            if len(filename) > 60:
-                filename = filename[:57] + "..."
-            result.append(
-                {
-                    "tag": tag,
-                    "progress_pct": float(pct),
-                    "state": state.upper(),
-                    "path": path_part,
-                    "filename": filename or "Unknown",
-                    "size_display": f"{size_val} {size_unit}",
-                }
-            )
-            _debug_log(
-                "mega_service:parse_transfer_list",
-                "parsed transfer",
-                {
-                    "line_num": line_num,
-                    "tag": tag,
-                    "filename": filename,
-                    "progress": pct,
-                    "state": state,
-                    "size": f"{size_val} {size_unit}",
-                },
-                hypothesis_id="H6",
-            )
-            continue
-
-        # Alternate MEGAcmd line: progress % without "of <size>" before state (or truncated path).
-        relaxed_match = re.search(
-            rf"({_TRANSFER_ARROW_CLASS})\s+(\d+)\s+(.*?)\s+(\d+(?:\.\d+)?)\s*%\s+(?:of\s+[\d.]+\s*[KMGT]?B\s+)?(\w+)\s*$",
-            line,
-        )
-        if relaxed_match:
-            _d, tag, path_part, pct, state = relaxed_match.groups()
-            path_part = path_part.strip()
-            filename = path_part.split("/")[-1].strip() if "/" in path_part else path_part
-            if "..." in path_part and "/" in path_part:
-                parts = path_part.split("...")
-                if len(parts) > 1 and "/" in parts[-1]:
-                    filename = parts[-1].split("/")[-1].strip()
-            if len(filename) > 60:
-                filename = filename[:57] + "..."
+        elif m["tag"] is not None:
+            path_part = m["path"].strip()
+            filename = _extract_filename(path_part)
+            size_val = m["size_val"]
             result.append(
                 {
-                    "tag": tag,
-                    "progress_pct": float(pct),
-                    "state": str(state).upper(),
+                    "tag": m["tag"],
+                    "progress_pct": float(m["pct"]),
+                    "state": m["state"].upper(),
                     "path": path_part,
                     "filename": filename or "Unknown",
-                    "size_display": "Unknown",
+                    "size_display": f"{size_val} {m['size_unit']}" if size_val is not None else "Unknown",
                 }
             )
-            continue
-
-        # Table-style: optional DOWNLOAD/UPLOAD keyword, tag, state, percent, path (no arrow).
-        dl_match = re.match(
-            r"(?i)^\s*(?:download|upload)\s+(\d+)\s+(\w+)\s+(\d+(?:\.\d+)?)%\s+(.+)$",
-            line,
-        )
-        if dl_match:
-            tag, state, pct, path = dl_match.groups()
-            path = path.strip()
-            filename = path.split("/")[-1] if "/" in path else path
+        else:
+            path = m["dl_path"].strip()
+            filename = path.rpartition("/")[2]
             result.append(
                 {
-                    "tag": tag,
-                    "progress_pct": float(pct),
-                    "state": str(state).upper(),
+                    "tag": m["dl_tag"],
+                    "progress_pct": float(m["dl_pct"]),
+                    "state": m["dl_state"].upper(),
                     "path": path,
                     "filename": filename,
                     "size_display": "Unknown",
                 }
             )
-            continue
-
-        if len(line) > 10:
-            _debug_log(
-                "mega_service:parse_transfer_list",
-                "unparsed line",
-                {"line_num": line_num, "line": line[:200]},
-                hypothesis_id="H6",
-            )
 
-    _debug_log(
-        "mega_service:parse_transfer_list",
-        "parsing complete",
-        {"total_lines": len(lines), "parsed_transfers": len(result)},
-        hypothesis_id="H6",
-    )
-    return result
+    if _DEBUG_LOG_ENABLED:
+        _debug_log(
+            "mega_service:parse_transfer_list",
+            "parsing complete",
+            {"total_lines": len(lines), "parsed_transfers": len(result)},
+            hypothesis_id="H6",
+        )
+    _parse_memo = (raw, result)
+    return [dict(t) for t in result]
 
 
 _SIZE_UNIT_RE = re.compile(r"^\s*([\d.]+)\s*([KMGT]?)B\s*$", re.IGNORECASE)
@@ -790,23 +1115,64 @@ def parsed_transfer_to_api_row(t: dict[str, Any]) -> dict[str, Any]:
     return row
 
 
-async def run_mega_get(url: str) -> tuple[bool, str | None]:
+def _decode_output(data: bytes) -> str:
+    """Subprocess output as text for logs and API payloads: UTF-8 with replacement, whitespace-stripped."""
+    return data.decode(errors="replace").strip() if data else ""
+
+
+# Per-stream retention for one-shot MEGAcmd commands; anything beyond is read and dropped.
+_PROC_OUTPUT_CAP = 64 * 1024
+_PROC_READ_CHUNK = 16 * 1024
+
+
+async def _read_capped(stream: asyncio.StreamReader | None, cap: int, *, tail: bool = False) -> bytes:
+    """Drain stream to EOF keeping at most cap bytes: the head, or the tail when tail=True."""
+    if stream is None:
+        return b""
+    buf = bytearray()
+    while chunk := await stream.read(_PROC_READ_CHUNK):
+        if tail:
+            buf += chunk
+            if len(buf) > cap:
+                del buf[: len(buf) - cap]
+        elif len(buf) < cap:
+            buf += chunk[: cap - len(buf)]
+    return bytes(buf)
+
+
+async def _communicate_capped(proc: asyncio.subprocess.Process, cap: int = _PROC_OUTPUT_CAP) -> tuple[bytes, bytes]:
+    """
+    Bounded communicate(): both pipes are drained concurrently so the child never blocks,
+    but only the head of stdout and the tail of stderr (where errors end up) are kept.
+    """
+    stdout_b, stderr_b = await asyncio.gather(
+        _read_capped(proc.stdout, cap),
+        _read_capped(proc.stderr, cap, tail=True),
+    )
+    await proc.wait()
+    return stdout_b, stderr_b
+
+
+async def run_mega_get(url: str, tags_before: set[str] | None = None) -> tuple[bool, str | None]:
     """
     Run mega-get for url. Returns (success, raw_error_detail_or_none).
     raw_error is suitable for operator logs; callers should redact before exposing to clients.
+    tags_before is the MEGAcmd tag set the caller saw just before the call; only a transfer outside it
+    counts as this download when deciding whether to nudge a RETRYING transfer. Without it, no nudge is sent.
     """
     if SIMULATE:
         log_buffer.append("URL Accepted (simulated)")
         await asyncio.sleep(1)
         return True, None
 
-    download_dir_abs = os.path.abspath(DOWNLOAD_DIR)
-    _debug_log(
-        "mega_service:run_mega_get:entry",
-        "mega-get invoked",
-        {"url_preview": url.strip()[:80], "download_dir": download_dir_abs, "cwd": os.getcwd()},
-        hypothesis_id="H1 H4",
-    )
+    dest_dir = download_dir_abs()
+    if _DEBUG_LOG_ENABLED:
+        _debug_log(
+            "mega_service:run_mega_get:entry",
+            "mega-get invoked",
+            {"url_preview": url.strip()[:80], "download_dir": dest_dir, "cwd": os.getcwd()},
+            hypothesis_id="H1 H4",
+        )
 
     log_buffer.append(f"Starting download to {DOWNLOAD_DIR}...")
 
@@ -815,72 +1181,70 @@ async def run_mega_get(url: str) -> tuple[bool, str | None]:
             *args,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
-            env=subprocess_env(),
+            env=spawn_env(),
         )
-        stdout_b, stderr_b = await proc.communicate()
+        stdout_b, stderr_b = await _communicate_capped(proc)
         rc = proc.returncode if proc.returncode is not None else -1
-        return rc, stdout_b or b"", stderr_b or b""
+        return rc, stdout_b, stderr_b
 
-    base_args = ["mega-get", "--ignore-quota-warn", url.strip(), download_dir_abs]
+    base_args = ["mega-get", "--ignore-quota-warn", url.strip(), dest_dir]
     rc, stdout, stderr = await _run_get(base_args)
 
-    _debug_log(
-        "mega_service:run_mega_get:exit",
-        "mega-get finished",
-        {
-            "returncode": rc,
-            "stdout_preview": (stdout or b"").decode(errors="replace")[:400].strip(),
-            "stderr_preview": (stderr or b"").decode(errors="replace")[:400].strip(),
-        },
-        hypothesis_id="H3",
-    )
+    if _DEBUG_LOG_ENABLED:
+        _debug_log(
+            "mega_service:run_mega_get:exit",
+            "mega-get finished",
+            {
+                "returncode": rc,
+                "stdout_preview": stdout[:400].decode(errors="replace").strip(),
+                "stderr_preview": stderr[:400].decode(errors="replace").strip(),
+            },
+            hypothesis_id="H3",
+        )
 
     if rc == 0:
-        out_msg = (stdout or b"").decode(errors="replace").strip()
-        err_msg = (stderr or b"").decode(errors="replace").strip()
-        log_buffer.append("✓ Download command accepted by MEGAcmd")
+        clear_transfer_list_cache()
+        out_msg = _decode_output(stdout)
+        err_msg = _decode_output(stderr)
+        lines = ["✓ Download command accepted by MEGAcmd"]
         if out_msg:
-            log_buffer.append(f"MEGAcmd: {out_msg[:800]}")
+            lines.append(f"MEGAcmd: {out_msg[:800]}")
         if err_msg:
-            log_buffer.append(f"MEGAcmd: {err_msg[:800]}")
+            lines.append(f"MEGAcmd: {err_msg[:800]}")
+        log_buffer.extend(lines)
         if not SIMULATE:
             await asyncio.sleep(2)
             try:
-                rproc = await asyncio.create_subprocess_exec(
-                    "mega-transfers",
-                    "-r",
-                    "-a",
-                    stdout=asyncio.subprocess.DEVNULL,
-                    stderr=asyncio.subprocess.DEVNULL,
-                    env=subprocess_env(),
-                )
-                r_stdout, _r_stderr = await rproc.communicate()
-                r_text = (r_stdout or b"").decode(errors="replace").strip()
-                if not r_text:
+                # Nudge only this download's transfer when it is stuck retrying; other transfers (possibly
+                # paused by the user) are left alone. Without tags_before the new tag is unknown: no nudge.
+                parsed = parse_transfer_list(await get_transfer_list())
+                if not parsed:
                     log_buffer.append(
                         "No active transfer detected after submit. The file may have completed instantly, "
                         "already exists at destination, or MEGAcmd queued nothing."
                     )
+                elif tags_before is not None:
+                    for t in parsed:
+                        if t["state"] == "RETRYING" and str(t["tag"]) not in tags_before:
+                            await _mega_transfers_exec("-r", str(t["tag"]))
             except Exception:
                 pass
     else:
-        err_msg = stderr.decode(errors="replace").strip() if stderr else ""
+        err_msg = _decode_output(stderr)
         err_l = err_msg.lower()
         if "already exists" in err_l:
             log_buffer.append("✓ File already exists at destination (MEGAcmd skipped download).")
             return True, None
-        log_buffer.append("✗ Error: Unable to start MEGA download")
-        if stderr:
-            if err_msg:
-                log_buffer.append(f"Details: {err_msg}")
-                if "segmentation fault" in err_l or "signal 11" in err_l or "mega-exec" in err_l:
-                    log_buffer.append("MEGAcmd crashed while handling this URL (segmentation fault).")
-                    log_buffer.append(
-                        "Try restarting MEGAcmd daemon (`mega-quit` then `mega-login ...`) or reinstall MEGAcmd."
-                    )
-                    log_buffer.append(
-                        "If it persists, run `mega-get <url> <dir>` directly in terminal to verify native MEGAcmd stability."
-                    )
+        lines = ["✗ Error: Unable to start MEGA download"]
+        if err_msg:
+            lines.append(f"Details: {err_msg}")
+            if "segmentation fault" in err_l or "signal 11" in err_l or "mega-exec" in err_l:
+                lines += [
+                    "MEGAcmd crashed while handling this URL (segmentation fault).",
+                    "Try restarting MEGAcmd daemon (`mega-quit` then `mega-login ...`) or reinstall MEGAcmd.",
+                    "If it persists, run `mega-get <url> <dir>` directly in terminal to verify native MEGAcmd stability.",
+                ]
+        log_buffer.extend(lines)
         return False, err_msg or "mega-get failed"
 
     return True, None
@@ -928,7 +1292,7 @@ async def run_mega_get_with_user_meta(
     """
     async with queue_dispatch_semaphore:
         tags_before = await _snapshot_transfer_tags()
-        ok, err = await run_mega_get(url)
+        ok, err = await run_mega_get(url, tags_before)
         if ok:
             attached = await _apply_metadata_after_mega_get(url, labels, priority, tags_before)
             if not attached and pending_id:
@@ -949,11 +1313,13 @@ async def _mega_transfers_exec(flag: str, target: str) -> tuple[int, str, str]:
         target,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
-        env=subprocess_env(),
+        env=spawn_env(),
     )
-    stdout, stderr = await proc.communicate()
-    out = (stdout or b"").decode(errors="replace").strip()
-    err = (stderr or b"").decode(errors="replace").strip()
+    stdout, stderr = await _communicate_capped(proc)
+    # The transfer set just changed: the next poll must not be answered from the TTL cache.
+    clear_transfer_list_cache()
+    out = _decode_output(stdout)
+    err = _decode_output(stderr)
     rc = proc.returncode
     if rc is None:
         rc = -1
@@ -974,13 +1340,13 @@ async def run_megacmd_command(args: list[str], cwd: str | None = None) -> dict[s
             *args,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
-            env=subprocess_env(),
+            env=spawn_env(),
             cwd=cwd,
         )
         stdout_b, stderr_b = await proc.communicate()
         code = proc.returncode if proc.returncode is not None else -1
-        stdout = (stdout_b or b"").decode(errors="replace").strip()
-        stderr = (stderr_b or b"").decode(errors="replace").strip()
+        stdout = _decode_output(stdout_b)
+        stderr = _decode_output(stderr_b)
         output = stdout if stdout else stderr
 
         if redact_output:
@@ -1009,9 +1375,10 @@ async def run_megacmd_command(args: list[str], cwd: str | None = None) -> dict[s
         }
     _record_command_event(event)
     if not event["ok"]:
-        log_buffer.append(f"Command failed ({event['exit_code']}): {event['command']}")
+        lines = [f"Command failed ({event['exit_code']}): {event['command']}"]
         if event["output"]:
-            log_buffer.append(f"Details: {event['output']}")
+            lines.append(f"Details: {event['output']}")
+        log_buffer.extend(lines)
     return event
 
 
@@ -1088,27 +1455,32 @@ async def get_account_info() -> dict[str, Any]:
     }
 
 
+# mega-transfers flag per action; resume goes through run_mega_transfers_resume_for_tag.
+_ACTION_FLAGS = {"cancel": "-c", "pause": "-p"}
+
+
 async def run_mega_transfers_action(action: str, tag: str) -> None:
     """pause | resume | cancel — per-tag MEGAcmd."""
     if action == "resume":
         await run_mega_transfers_resume_for_tag(tag, log_label="Resume")
         return
 
+    label = action.title()
     if SIMULATE:
-        log_buffer.append(f"{action.title()} transfer {tag} (simulated)")
+        log_buffer.append(f"{label} transfer {tag} (simulated)")
         return
 
-    flag = {"cancel": "-c", "pause": "-p"}.get(action, "-c")
-    code, out, err = await _mega_transfers_exec(flag, tag.strip() if tag else "-a")
+    target = tag.strip() if tag else "-a"
+    code, out, err = await _mega_transfers_exec(_ACTION_FLAGS.get(action, "-c"), target)
 
-    if out:
-        log_buffer.append(out)
+    lines = [out] if out else []
     if code != 0:
-        log_buffer.append(f"{action.title()} failed for transfer {tag} (exit {code})")
+        lines.append(f"{label} failed for transfer {tag} (exit {code})")
         if err:
-            log_buffer.append(f"Details: {err[:800]}")
+            lines.append(f"Details: {err[:800]}")
     else:
-        log_buffer.append(f"{action.title()} command sent for transfer {tag}")
+        lines.append(f"{label} command sent for transfer {tag}")
+    log_buffer.extend(lines)
 
 
 async def run_mega_transfers_resume_for_tag(tag: str, *, log_label: str) -> None:
@@ -1118,14 +1490,14 @@ async def run_mega_transfers_resume_for_tag(tag: str, *, log_label: str) -> None
         return
 
     code, out, err = await _mega_transfers_exec("-r", tag.strip())
-    if out:
-        log_buffer.append(out)
+    lines = [out] if out else []
     if code != 0:
-        log_buffer.append(f"{log_label} (mega-transfers -r) failed for transfer {tag} (exit {code})")
+        lines.append(f"{log_label} (mega-transfers -r) failed for transfer {tag} (exit {code})")
         if err:
-            log_buffer.append(f"Details: {err[:800]}")
+            lines.append(f"Details: {err[:800]}")
     else:
-        log_buffer.append(f"{log_label} (resume) sent for transfer {tag} — mega-transfers -r {tag}")
+        lines.append(f"{log_label} (resume) sent for transfer {tag} — mega-transfers -r {tag}")
+    log_buffer.extend(lines)
 
 
 async def run_mega_transfers_cancel_all() -> None:
@@ -1135,11 +1507,11 @@ async def run_mega_transfers_cancel_all() -> None:
         return
 
     code, out, err = await _mega_transfers_exec("-c", "-a")
-    if out:
-        log_buffer.append(out)
-    log_buffer.append(f"Cancel-all: mega-transfers -c -a completed (exit {code})")
+    lines = [out] if out else []
+    lines.append(f"Cancel-all: mega-transfers -c -a completed (exit {code})")
     if code != 0 and err:
-        log_buffer.append(f"Details: {err[:800]}")
+        lines.append(f"Details: {err[:800]}")
+    log_buffer.extend(lines)
 
 
 def is_web_server_mode() -> bool:
@@ -158,7 +158,7 @@ async def api_terminal(
                 pass
 
     # Harden terminal commands: prevent arbitrary path access and SSRF
-    abs_download_dir = os.path.abspath(ms.DOWNLOAD_DIR)
+    abs_download_dir = ms.download_dir_abs()
 
     for part in parts[1:]:
         # 1. URL/SSRF Validation
@@ -17,7 +17,7 @@ def read_json_dict(path: Path) -> dict[str, Any]:
         return {}
 
 
-def write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+def write_json_atomic(path: Path, data: dict[str, Any] | list[Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(f"{path.suffix}.tmp")
     with open(tmp, "w", encoding="utf-8") as f:
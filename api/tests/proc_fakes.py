@@ -0,0 +1,29 @@
+"""Stand-ins for asyncio subprocesses shared by the mega_service tests."""
+
+from __future__ import annotations
+
+import asyncio
+
+
+def _reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class FakeProc:
+    """Finished process whose output is readable via communicate() or its stdout/stderr pipes."""
+
+    def __init__(self, stdout=b"", stderr=b"", returncode=0):
+        self._stdout = stdout
+        self._stderr = stderr
+        self.returncode = returncode
+        self.stdout = _reader(stdout)
+        self.stderr = _reader(stderr)
+
+    async def communicate(self):
+        return self._stdout, self._stderr
+
+    async def wait(self):
+        return self.returncode
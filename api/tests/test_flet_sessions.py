@@ -0,0 +1,97 @@
+"""The archived Flet UI keeps render state per page: web mode serves every browser session from one process."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import sys
+from functools import partial
+from pathlib import Path
+
+import flet as ft
+import mega_service as ms
+import pytest
+
+_MAIN_PATH = Path(__file__).resolve().parents[2] / "archive" / "flet" / "main.py"
+
+
+@pytest.fixture
+def flet_main(monkeypatch):
+    spec = importlib.util.spec_from_file_location("flet_archive_main", _MAIN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, spec.name, module)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(ms, "SIMULATE", True)
+    monkeypatch.setattr(ms, "UI_TEST_MODE", False)
+    monkeypatch.setattr(module, "_REFRESH_INTERVAL", 0)
+    ms.clear_transfer_list_cache()
+    return module
+
+
+class _FakePage:
+    def __init__(self):
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+
+    def run_task(self, handler, *args):
+        return asyncio.ensure_future(handler(*args))
+
+
+def _open_session(flet_main):
+    session = flet_main._Session(_FakePage())
+    cards, log = ft.ListView(), ft.TextField()
+    session.refresh = partial(flet_main._refresh_ui, session, cards, log)
+    flet_main._sessions.add(session)
+    return session, cards, log
+
+
+def test_second_session_renders_transfers_and_log(flet_main):
+    ms.log_buffer.clear()
+    ms.log_buffer.append("hello")
+
+    async def run():
+        opened = []
+        for _ in range(2):
+            session, cards, log = _open_session(flet_main)
+            await flet_main.poll_transfers(session)
+            await asyncio.sleep(0.01)
+            opened.append((session, cards, log))
+        return opened
+
+    (a, cards_a, log_a), (b, cards_b, log_b) = asyncio.run(run())
+    assert len(cards_a.controls) == len(cards_b.controls) == 2
+    assert not set(map(id, cards_a.controls)) & set(map(id, cards_b.controls))
+    assert log_a.value == log_b.value == "hello"
+    assert a.page.updates >= 1 and b.page.updates >= 1
+
+
+def test_updates_and_wakeups_reach_every_session(flet_main):
+    async def run():
+        a, _, _ = _open_session(flet_main)
+        b, _, _ = _open_session(flet_main)
+        flet_main._schedule_update(a)
+        flet_main._schedule_update(b)
+        flet_main._wake_pollers()
+        await asyncio.sleep(0)
+        return a, b
+
+    a, b = asyncio.run(run())
+    assert a.page.updates == b.page.updates == 1
+    assert a.poll_wake.is_set() and b.poll_wake.is_set()
+
+
+def test_closing_the_last_session_flushes_pending_history(flet_main, monkeypatch):
+    flushes = []
+    monkeypatch.setattr(ms, "flush_pending_history", lambda: flushes.append(1))
+
+    async def run():
+        a, _, _ = _open_session(flet_main)
+        b, _, _ = _open_session(flet_main)
+        flet_main._close_session(a)
+        assert flushes == []
+        flet_main._close_session(b)
+
+    asyncio.run(run())
+    assert flushes == [1]
@@ -1,5 +1,7 @@
 """Smoke tests for mega_service helpers (no MEGAcmd required)."""
 
+import json
+
 import mega_service as ms
 
 
@@ -66,6 +68,34 @@ def test_parse_transfer_list_relaxed_line_without_of_clause():
     assert rows[0]["size_display"] == "Unknown"
 
 
+def test_parse_transfer_list_skips_table_headers():
+    raw = (
+        "TYPE     TAG  SOURCEPATH  DESTINYPATH  PROGRESS  STATE\n"
+        "TRANSFER  STATE     PROGRESS  PATH\n"
+        "⇓    42  /Downloads/a.iso  5.0% of  1.00 GB ACTIVE\n"
+    )
+    rows = ms.parse_transfer_list(raw)
+    assert [r["tag"] for r in rows] == ["42"]
+
+
+def test_parse_transfer_list_reuses_rows_for_repeated_output(monkeypatch):
+    raw = "⇓    42  /Downloads/a.iso  5.0% of  1.00 GB ACTIVE\n"
+    first = ms.parse_transfer_list(raw)
+    first[0]["state"] = "MUTATED"
+    monkeypatch.setattr(ms, "_TRANSFER_LINE_RE", None)  # a cache miss would fail loudly
+    again = ms.parse_transfer_list(raw)
+    assert again[0]["state"] == "ACTIVE"
+    assert again[0] is not first[0]
+
+
+def test_parse_transfer_list_shortens_elided_and_long_filenames():
+    long_name = "x" * 70 + ".bin"
+    raw = f"⇓    7  ...ownloads/sub/{long_name}  5.0% of  1.00 GB ACTIVE\n"
+    rows = ms.parse_transfer_list(raw)
+    assert rows[0]["filename"] == "x" * 57 + "..."
+    assert ms._extract_filename("...oads/movie.mkv") == "movie.mkv"
+
+
 def test_parsed_transfer_to_api_row_unknown_size():
     row = ms.parsed_transfer_to_api_row(
         {
@@ -122,3 +152,119 @@ Transfer quota: 250 bytes of 400 bytes
     assert ok is True
     assert (su, st) == (100, 1000)
     assert (bu, bl) == (250, 400)
+
+
+def test_log_buffer_is_bounded_and_caches_joined_text():
+    buf = ms.LogBuffer(max_lines=3)
+    for i in range(5):
+        buf.append(f"line {i}")
+    assert buf.get_lines() == ["line 2", "line 3", "line 4"]
+    text = buf.get_text()
+    assert text == "line 2\nline 3\nline 4"
+    assert buf.get_text() is text
+    buf.append("line 5")
+    assert buf.get_text().endswith("line 5")
+    buf.clear()
+    assert buf.get_text() == ""
+
+
+def test_log_buffer_coalesces_identical_consecutive_lines():
+    buf = ms.LogBuffer(max_lines=5)
+    for _ in range(3):
+        buf.append("retrying")
+    buf.append("done")
+    buf.append("retrying")
+    assert buf.get_lines() == ["retrying (×3)", "done", "retrying"]
+    buf.clear()
+    buf.append("done")
+    assert buf.get_lines() == ["done"]
+
+
+def test_log_buffer_cached_text_tracks_evictions_and_duplicates():
+    for max_lines in (1, 3):
+        buf = ms.LogBuffer(max_lines=max_lines)
+        buf.get_text()
+        for line in ["a", "a", "b", "c", "c", "c", "d", "e", "e", "f"]:
+            buf.append(line)
+            assert buf._text == "\n".join(buf.get_lines())
+
+
+def test_log_buffer_extend_notifies_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ms, "_log_notify", lambda: calls.append(1))
+    buf = ms.LogBuffer(max_lines=5)
+    buf.extend(["a", "b", "b"])
+    buf.extend([])
+    assert buf.get_lines() == ["a", "b (×2)"]
+    assert calls == [1]
+
+
+def test_subprocess_env_is_cached_until_cleared(monkeypatch):
+    ms.clear_subprocess_env_cache()
+    monkeypatch.setattr(ms, "MEGACMD_PATH", "")
+    env = ms.subprocess_env()
+    assert ms.subprocess_env() is env
+
+    monkeypatch.setattr(ms, "MEGACMD_PATH", "/opt/megacmd")
+    env2 = ms.subprocess_env()
+    assert env2 is not env
+    assert env2["PATH"].startswith("/opt/megacmd")
+
+    monkeypatch.setenv("MEGA_TEST_ENV_CACHE", "1")
+    assert "MEGA_TEST_ENV_CACHE" not in ms.subprocess_env()
+    ms.clear_subprocess_env_cache()
+    assert ms.subprocess_env()["MEGA_TEST_ENV_CACHE"] == "1"
+    ms.clear_subprocess_env_cache()
+
+
+def test_debug_log_is_noop_unless_enabled():
+    if ms._DEBUG_LOG_ENABLED:
+        assert ms._debug_log is ms._debug_log_write
+    else:
+        assert ms._debug_log is ms._debug_log_disabled
+        assert ms._debug_log("loc", "msg", {"k": "v"}) is None
+
+
+def test_debug_log_writer_drains_queue_on_stop(tmp_path, monkeypatch):
+    log_path = tmp_path / "debug.log"
+    monkeypatch.setattr(ms, "DEBUG_LOG_PATH", str(log_path))
+    for i in range(3):
+        ms._debug_log_write("loc", "msg", {"i": i})
+    ms._stop_debug_log_writer()
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["data"]["i"] for line in lines] == [0, 1, 2]
+
+
+def test_debug_log_writer_restarts_without_reregistering_atexit(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(ms.atexit, "register", registered.append)
+    monkeypatch.setattr(ms, "_debug_log_atexit_registered", False)
+    monkeypatch.setattr(ms, "DEBUG_LOG_PATH", str(tmp_path / "debug.log"))
+    for _ in range(2):
+        ms._debug_log_write("loc", "msg")
+        ms._stop_debug_log_writer()
+        assert ms._debug_log_writer is None
+    assert registered == [ms._stop_debug_log_writer]
+
+
+def test_debug_log_writer_closes_handle_after_write_error(tmp_path, monkeypatch):
+    opened = []
+
+    class _BrokenFile:
+        closed = False
+
+        def writelines(self, _lines):
+            raise OSError("disk full")
+
+        def close(self):
+            self.closed = True
+
+    def fake_open(*_args, **_kwargs):
+        opened.append(_BrokenFile())
+        return opened[-1]
+
+    monkeypatch.setattr(ms, "open", fake_open, raising=False)
+    monkeypatch.setattr(ms, "DEBUG_LOG_PATH", str(tmp_path / "debug.log"))
+    ms._debug_log_write("loc", "msg")
+    ms._stop_debug_log_writer()
+    assert opened and all(f.closed for f in opened)
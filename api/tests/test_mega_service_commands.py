@@ -5,16 +5,7 @@ import json
 from pathlib import Path
 
 import mega_service as ms
-
-
-class _FakeProc:
-    def __init__(self, stdout=b"", stderr=b"", returncode=0):
-        self._stdout = stdout
-        self._stderr = stderr
-        self.returncode = returncode
-
-    async def communicate(self):
-        return self._stdout, self._stderr
+from proc_fakes import FakeProc as _FakeProc
 
 
 def test_subprocess_env_prepends_megacmd_path(monkeypatch):
@@ -23,6 +14,13 @@ def test_subprocess_env_prepends_megacmd_path(monkeypatch):
     assert env["PATH"].startswith("/opt/megacmd")
 
 
+def test_spawn_env_inherits_unless_megacmd_path_is_set(monkeypatch):
+    monkeypatch.setattr(ms, "MEGACMD_PATH", "")
+    assert ms.spawn_env() is None
+    monkeypatch.setattr(ms, "MEGACMD_PATH", "/opt/megacmd")
+    assert ms.spawn_env()["PATH"].startswith("/opt/megacmd")
+
+
 def test_mega_cmd_server_binary_uses_which(monkeypatch):
     monkeypatch.setattr(ms, "MEGACMD_PATH", "")
     monkeypatch.setattr(
@@ -42,6 +40,20 @@ def test_mega_transfers_exec_handles_none_returncode(monkeypatch):
     assert err == ""
 
 
+def test_communicate_capped_keeps_stdout_head_and_stderr_tail():
+    script = "head -c 200000 /dev/zero | tr '\\0' o; head -c 200000 /dev/zero | tr '\\0' e >&2; echo END >&2"
+
+    async def run():
+        proc = await asyncio.create_subprocess_exec(
+            "sh", "-c", script, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        return await ms._communicate_capped(proc, cap=1024)
+
+    out, err = asyncio.run(run())
+    assert out == b"o" * 1024
+    assert len(err) == 1024 and err.endswith(b"eEND\n")
+
+
 def test_run_megacmd_command_success(monkeypatch):
     async def fake_exec(*args, **kwargs):
         return _FakeProc(b"done\n", b"", 0)
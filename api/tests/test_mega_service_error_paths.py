@@ -33,6 +33,55 @@ def test_history_load_and_save_roundtrip(tmp_path, monkeypatch):
     assert loaded[0] == "u3"
 
 
+def test_history_save_is_deferred_and_coalesced_inside_event_loop(tmp_path, monkeypatch):
+    history = tmp_path / "history.json"
+    ms.set_history_path(str(history))
+    monkeypatch.setattr(ms, "_HISTORY_SAVE_DELAY_SEC", 0.01)
+    ms.clear_history()
+
+    async def burst():
+        ms.add_url_to_history("a")
+        ms.add_url_to_history("b")
+        assert json.loads(history.read_text(encoding="utf-8")) == []
+        await asyncio.sleep(0.05)
+
+    asyncio.run(burst())
+    assert json.loads(history.read_text(encoding="utf-8")) == ["b", "a"]
+
+
+def test_flush_pending_history_only_writes_a_pending_save(tmp_path, monkeypatch):
+    history = tmp_path / "history.json"
+    history.write_text("not json", encoding="utf-8")
+    ms.set_history_path(str(history))
+    monkeypatch.setattr(ms, "_HISTORY_SAVE_DELAY_SEC", 60)
+    ms.load_history()
+    ms.flush_pending_history()
+    assert history.read_text(encoding="utf-8") == "not json"
+
+    async def add_then_shutdown():
+        ms.add_url_to_history("pending")
+        ms.flush_pending_history()
+
+    asyncio.run(add_then_shutdown())
+    assert json.loads(history.read_text(encoding="utf-8"))[0] == "pending"
+
+
+def test_history_load_skips_unchanged_file(tmp_path):
+    history = tmp_path / "history.json"
+    history.write_text(json.dumps(["u1"]), encoding="utf-8")
+    ms.set_history_path(str(history))
+    ms.load_history()
+    assert ms.get_history() == ["u1"]
+
+    ms._url_history.insert(0, "in-memory")
+    ms.load_history()
+    assert ms.get_history()[0] == "in-memory"
+
+    history.write_text(json.dumps(["u2", "u3"]), encoding="utf-8")
+    ms.load_history()
+    assert ms.get_history() == ["u2", "u3"]
+
+
 def test_mega_cmd_server_binary_darwin_megacmd_bundle(monkeypatch, tmp_path):
     fake_bin = tmp_path / "MEGAcmd"
     fake_bin.write_text("#!/bin/sh\n", encoding="utf-8")
@@ -64,6 +113,27 @@ def test_wait_for_mega_server_ready_timeout_and_oserror(monkeypatch):
     assert asyncio.run(ms.wait_for_mega_server_ready(max_wait_sec=2.0)) is False
 
 
+def test_probe_mega_socket_closes_its_connection(tmp_path, monkeypatch):
+    sock_path = str(tmp_path / "megacmd.socket")
+    monkeypatch.setattr(ms, "_mega_socket_paths", lambda: [sock_path])
+
+    async def run():
+        closed = asyncio.Event()
+
+        async def on_client(reader, writer):
+            await reader.read()
+            closed.set()
+            writer.close()
+
+        server = await asyncio.start_unix_server(on_client, path=sock_path)
+        async with server:
+            ok = await ms._probe_mega_socket()
+            await asyncio.wait_for(closed.wait(), timeout=1.0)
+        return ok
+
+    assert asyncio.run(run()) is True
+
+
 def test_ensure_server_start_failure_still_checks_ready(monkeypatch):
     monkeypatch.setattr(ms, "SIMULATE", False)
     monkeypatch.setattr(ms, "in_docker", lambda: False)
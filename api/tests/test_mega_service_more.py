@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import subprocess
 
 import mega_service as ms
 
@@ -77,16 +78,10 @@ def test_get_transfer_list_uses_stderr_when_stdout_empty(monkeypatch):
     monkeypatch.setattr(ms, "SIMULATE", False)
     monkeypatch.setattr(ms, "UI_TEST_MODE", False)
 
-    class _Proc:
-        returncode = 0
-
-        async def communicate(self):
-            return (b"", b"stderr-only-line\n")
-
-    async def fake_exec(*args, **kwargs):
-        return _Proc()
+    def fake_run(args, **kwargs):
+        return subprocess.CompletedProcess(args, 0, b"", b"stderr-only-line\n")
 
-    monkeypatch.setattr(ms.asyncio, "create_subprocess_exec", fake_exec)
+    monkeypatch.setattr(ms.subprocess, "run", fake_run)
     out = asyncio.run(ms.get_transfer_list())
     assert "stderr-only" in out
 
@@ -96,21 +91,49 @@ def test_get_transfer_list_merges_stderr_when_stdout_present(monkeypatch):
     monkeypatch.setattr(ms, "SIMULATE", False)
     monkeypatch.setattr(ms, "UI_TEST_MODE", False)
 
-    class _Proc:
-        returncode = 0
-
-        async def communicate(self):
-            return (b"out-line\n", b"err-line\n")
-
-    async def fake_exec(*args, **kwargs):
-        return _Proc()
+    def fake_run(args, **kwargs):
+        return subprocess.CompletedProcess(args, 0, b"out-line\n", b"err-line\n")
 
-    monkeypatch.setattr(ms.asyncio, "create_subprocess_exec", fake_exec)
+    monkeypatch.setattr(ms.subprocess, "run", fake_run)
     out = asyncio.run(ms.get_transfer_list())
     assert "out-line" in out
     assert "err-line" in out
 
 
+def test_get_transfer_list_timeout_returns_last_output_uncached(monkeypatch):
+    ms.clear_transfer_list_cache()
+    monkeypatch.setattr(ms, "SIMULATE", False)
+    monkeypatch.setattr(ms, "UI_TEST_MODE", False)
+    monkeypatch.setattr(ms, "_transfer_output_text", "1 ACTIVE 5% /data/a.bin\n")
+
+    def slow_run(args, **kwargs):
+        raise subprocess.TimeoutExpired(args, kwargs["timeout"])
+
+    monkeypatch.setattr(ms.subprocess, "run", slow_run)
+    ms.log_buffer.clear()
+    assert asyncio.run(ms.get_transfer_list()) == "1 ACTIVE 5% /data/a.bin\n"
+    assert ms._transfer_list_cache is None
+    assert any("did not answer" in line for line in ms.log_buffer.get_lines())
+
+
+def test_get_transfer_list_concurrent_callers_share_one_spawn(monkeypatch):
+    ms.clear_transfer_list_cache()
+    monkeypatch.setattr(ms, "SIMULATE", False)
+    monkeypatch.setattr(ms, "UI_TEST_MODE", False)
+    calls = []
+
+    def fake_run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, b"out-line\n", b"")
+
+    async def run_many():
+        return await asyncio.gather(*(ms.get_transfer_list() for _ in range(4)))
+
+    monkeypatch.setattr(ms.subprocess, "run", fake_run)
+    assert asyncio.run(run_many()) == ["out-line\n"] * 4
+    assert len(calls) == 1
+
+
 def test_parse_transfer_list_relaxed_progress_line():
     raw = "v 10 /some/nested/file.zip 45.2% ACTIVE\n"
     rows = ms.parse_transfer_list(raw)
@@ -171,3 +194,65 @@ def test_parsed_transfer_to_api_row_merges_metadata(tmp_path, monkeypatch):
     assert row["priority"] == "LOW"
     assert row["speed_limit_kbps"] == 128
     assert row["tags"] == []
+
+
+def test_wait_for_mega_server_ready_accepts_listening_socket_without_spawning(monkeypatch, tmp_path):
+    sock_path = str(tmp_path / "srv")
+    spawned = []
+
+    async def fake_exec(*args, **kwargs):
+        spawned.append(args)
+        raise OSError("should not spawn")
+
+    async def run():
+        server = await asyncio.start_unix_server(lambda _r, w: w.close(), path=sock_path)
+        async with server:
+            return await ms.wait_for_mega_server_ready(max_wait_sec=1.0)
+
+    monkeypatch.setattr(ms, "_mega_socket_paths", lambda: [str(tmp_path / "missing"), sock_path])
+    monkeypatch.setattr(ms.asyncio, "create_subprocess_exec", fake_exec)
+    assert asyncio.run(run()) is True
+    assert spawned == []
+
+
+def test_get_transfer_list_reuses_decoded_text_for_identical_output(monkeypatch):
+    monkeypatch.setattr(ms, "SIMULATE", False)
+    monkeypatch.setattr(ms, "UI_TEST_MODE", False)
+
+    def fake_run(args, **kwargs):
+        return subprocess.CompletedProcess(args, 0, b"same-line\n", b"")
+
+    monkeypatch.setattr(ms.subprocess, "run", fake_run)
+    ms.clear_transfer_list_cache()
+    first = asyncio.run(ms.get_transfer_list())
+    ms.clear_transfer_list_cache()
+    assert asyncio.run(ms.get_transfer_list()) is first
+
+
+def test_transfer_action_invalidates_cached_transfer_list(monkeypatch):
+    monkeypatch.setattr(ms, "SIMULATE", False)
+    monkeypatch.setattr(ms, "UI_TEST_MODE", False)
+    outputs = iter([b"before\n", b"after\n"])
+
+    def fake_run(args, **kwargs):
+        return subprocess.CompletedProcess(args, 0, next(outputs), b"")
+
+    class _Proc:
+        returncode = 0
+        stdout = stderr = None
+
+        async def wait(self):
+            return 0
+
+    async def fake_exec(*args, **kwargs):
+        return _Proc()
+
+    async def run():
+        first = await ms.get_transfer_list()
+        await ms._mega_transfers_exec("-p", "7")
+        return first, await ms.get_transfer_list()
+
+    ms.clear_transfer_list_cache()
+    monkeypatch.setattr(ms.subprocess, "run", fake_run)
+    monkeypatch.setattr(ms.asyncio, "create_subprocess_exec", fake_exec)
+    assert asyncio.run(run()) == ("before\n", "after\n")
@@ -3,16 +3,7 @@ from __future__ import annotations
 import asyncio
 
 import mega_service as ms
-
-
-class _FakeProc:
-    def __init__(self, stdout=b"", stderr=b"", returncode=0):
-        self._stdout = stdout
-        self._stderr = stderr
-        self.returncode = returncode
-
-    async def communicate(self):
-        return self._stdout, self._stderr
+from proc_fakes import FakeProc as _FakeProc
 
 
 def test_run_mega_get_simulate(monkeypatch):
@@ -37,13 +28,72 @@ def test_run_mega_get_success_path(monkeypatch):
             return _FakeProc(b"accepted", b"", 0)
         return _FakeProc(b"", b"", 0)
 
+    async def fake_list():
+        return (
+            "⇓    1200  /Downloads/paused.zip  40.0% of  1.00 GB RETRYING\n"
+            "⇓    3456  /Downloads/large_archive.zip  12.8% of  8.91 GB RETRYING\n"
+        )
+
     monkeypatch.setattr(ms.asyncio, "create_subprocess_exec", fake_exec)
+    monkeypatch.setattr(ms, "get_transfer_list", fake_list)
     ms.log_buffer.clear()
-    ok, err = asyncio.run(ms.run_mega_get("https://mega.nz/file/ok"))
+    ok, err = asyncio.run(ms.run_mega_get("https://mega.nz/file/ok", {"1200"}))
     assert ok is True and err is None
     logs = "\n".join(ms.log_buffer.get_lines())
     assert "accepted" in logs.lower() or "download command accepted" in logs.lower()
-    assert any(c[0] == "mega-transfers" for c in calls)
+    # Only the transfer this mega-get created is resumed; the one that was already there is left alone.
+    assert [c for c in calls if c[0] == "mega-transfers"] == [("mega-transfers", "-r", "3456")]
+
+
+def test_run_mega_get_spawns_only_mega_get_and_one_transfer_list(monkeypatch):
+    monkeypatch.setattr(ms, "SIMULATE", False)
+    monkeypatch.setattr(ms, "UI_TEST_MODE", False)
+    monkeypatch.setattr(ms, "DOWNLOAD_DIR", "/tmp")
+    _orig_sleep = ms.asyncio.sleep
+    monkeypatch.setattr(ms.asyncio, "sleep", lambda _s: _orig_sleep(0))
+    ms.clear_transfer_list_cache()
+
+    spawned = []
+
+    async def fake_exec(*args, **kwargs):
+        spawned.append(args[0])
+        return _FakeProc(b"accepted", b"", 0)
+
+    def fake_run(args, **kwargs):
+        spawned.append(args[0])
+        out = b"\xe2\x87\x93    3456  /Downloads/a.zip  1.0% of  1.00 GB ACTIVE\n"
+        return ms.subprocess.CompletedProcess(args, 0, out, b"")
+
+    monkeypatch.setattr(ms.asyncio, "create_subprocess_exec", fake_exec)
+    monkeypatch.setattr(ms.subprocess, "run", fake_run)
+    ok, _err = asyncio.run(ms.run_mega_get("https://mega.nz/file/ok", {"1200"}))
+    assert ok is True
+    # The caller supplies the tag snapshot, so only the post-submit check lists transfers.
+    assert spawned == ["mega-get", "mega-transfers"]
+
+
+def test_run_mega_get_skips_resume_nudge_when_nothing_is_retrying(monkeypatch):
+    monkeypatch.setattr(ms, "SIMULATE", False)
+    monkeypatch.setattr(ms, "DOWNLOAD_DIR", "/tmp")
+    _orig_sleep = ms.asyncio.sleep
+    monkeypatch.setattr(ms.asyncio, "sleep", lambda _s: _orig_sleep(0))
+
+    calls = []
+
+    async def fake_exec(*args, **kwargs):
+        calls.append(args)
+        return _FakeProc(b"accepted", b"", 0)
+
+    async def fake_list():
+        return "⇓    9012  /Downloads/document.pdf  0.0% of  15.2 MB ACTIVE\n"
+
+    monkeypatch.setattr(ms.asyncio, "create_subprocess_exec", fake_exec)
+    monkeypatch.setattr(ms, "get_transfer_list", fake_list)
+    ms.log_buffer.clear()
+    ok, _err = asyncio.run(ms.run_mega_get("https://mega.nz/file/ok"))
+    assert ok is True
+    assert [c[0] for c in calls] == ["mega-get"]
+    assert not any("no active transfer" in line.lower() for line in ms.log_buffer.get_lines())
 
 
 def test_run_mega_get_fails_on_segfault_without_insecure_fallback(monkeypatch):
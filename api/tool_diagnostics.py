@@ -7,19 +7,20 @@ import os
 import shutil
 import subprocess
 import sys
+from collections.abc import Mapping
 from typing import Any
 
 import mega_service as ms
 
 
-def _run_version_command(cmd: list[str], *, env: dict[str, str] | None = None) -> str:
+def _run_version_command(cmd: list[str], *, env: Mapping[str, str] | None = None) -> str:
     try:
         proc = subprocess.run(
             cmd,
             capture_output=True,
             text=True,
             timeout=3,
-            env=env or os.environ.copy(),
+            env=env,
             check=False,
         )
         out = (proc.stdout or "").strip()
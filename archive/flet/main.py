@@ -2,30 +2,140 @@
 MEGA Get - Flet prototype.
 Web UI for mega-get-server: add MEGA URLs, view transfers, cancel/pause/resume.
 """
+from __future__ import annotations
+
 import asyncio
 import os
-import shutil
 import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from functools import partial
 
 import flet as ft
 
 import mega_service as ms
 
-_transfer_list: str = ""
 _retrying_hint_shown: bool = False
-_refresh_ui_callback: callable | None = None
+
+# Refresh coalescing: the first request renders immediately, later ones within the window collapse into one.
+_REFRESH_INTERVAL = 0.05  # at most ~20 renders per second during log bursts
+
+
+@dataclass
+class _TransferCard:
+    """Controls of one transfer card that change between polls; the rest of the tree is built once."""
+
+    card: ft.Card
+    icon: ft.Icon
+    filename_text: ft.Text
+    state_text: ft.Text
+    state_badge: ft.Container
+    progress_text: ft.Text
+    progress_bar: ft.ProgressBar
+    last_state: str | None = None
+    last_pct_int: int = -1
+
+
+@dataclass(eq=False)
+class _Session:
+    """
+    Render and polling state of one page. In web mode every browser session runs in this process, and a
+    control can only have one parent, so nothing here may be shared between sessions.
+    """
+
+    page: ft.Page
+    refresh: Callable[[], None] | None = None
+    # Transfer output as last fetched by this session's poller, and as last pushed to its controls.
+    transfer_list: str = ""
+    parsed_transfers: list[dict] = field(default_factory=list)
+    rendered_transfer_list: str | None = None
+    last_log_value: str | None = None
+    # Cards keyed by MEGAcmd tag, reused across refreshes so only changed properties are sent to the client.
+    cards_by_tag: dict[str, _TransferCard] = field(default_factory=dict)
+    # History tiles are pooled; a refresh only rewrites the slots whose URL changed.
+    history_tiles: list[ft.ListTile] = field(default_factory=list)
+    history_shown: list[str] | None = None
+    # page.update() coalescing: every mutation in one event-loop turn is flushed by a single update.
+    update_pending: bool = False
+    refresh_scheduled: bool = False
+    refresh_pending: bool = False
+    poll_wake: asyncio.Event = field(default_factory=asyncio.Event)
+    poll_task: Future | None = None
+
+
+# Open sessions; log changes and user actions reach all of them.
+_sessions: set[_Session] = set()
+
+
+def _schedule_update(session: _Session) -> None:
+    if session.update_pending:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        session.page.update()
+        return
+    session.update_pending = True
+    loop.call_soon(_flush_update, session)
+
+
+def _flush_update(session: _Session) -> None:
+    session.update_pending = False
+    session.page.update()
+
+
+def _schedule_refresh(session: _Session) -> None:
+    if session.refresh_scheduled:
+        session.refresh_pending = True
+        return
+    session.refresh_scheduled = True
+    session.page.run_task(_debounced_refresh, session)
+
+
+async def _debounced_refresh(session: _Session) -> None:
+    try:
+        while True:
+            session.refresh_pending = False
+            if session.refresh:
+                session.refresh()
+            await asyncio.sleep(_REFRESH_INTERVAL)
+            if not session.refresh_pending:
+                break
+    finally:
+        session.refresh_scheduled = False
+
+
+def _notify_sessions() -> None:
+    """Log-notify hook: every open session re-renders its log."""
+    for session in list(_sessions):
+        _schedule_refresh(session)
 
 
 def _refresh_ui(
-    page: ft.Page,
-    transfers_container: ft.Column,
+    session: _Session,
+    transfers_container: ft.ListView,
     log_text: ft.TextField,
 ) -> None:
-    parsed = ms.parse_transfer_list(_transfer_list)
-    transfers_container.controls = _build_transfer_cards(page, log_text, parsed)
+    transfer_list = session.transfer_list
+    log_value = ms.log_buffer.get_text() or "Ready to download..."
+    # Nothing new from the poller or the log: leave the controls alone and skip the round-trip.
+    if transfer_list == session.rendered_transfer_list and log_value == session.last_log_value:
+        return
+    if log_value != session.last_log_value:
+        session.last_log_value = log_value
+        log_text.value = log_value
+    if transfer_list == session.rendered_transfer_list:
+        _schedule_update(session)
+        return
+    session.rendered_transfer_list = transfer_list
+
+    parsed = session.parsed_transfers
+    transfers_container.controls = _sync_transfer_cards(session, parsed)
 
     if not parsed:
-        if _transfer_list and len(_transfer_list.strip()) > 0:
+        if transfer_list and len(transfer_list.strip()) > 0:
             transfers_container.controls = [
                 ft.Container(
                     content=ft.Column(
@@ -45,7 +155,7 @@ def _refresh_ui(
                             ),
                             ft.Container(
                                 content=ft.Text(
-                                    _transfer_list[:500] + ("..." if len(_transfer_list) > 500 else ""),
+                                    transfer_list[:500] + ("..." if len(transfer_list) > 500 else ""),
                                     size=10,
                                     color=ft.Colors.GREY_600,
                                     selectable=True,
@@ -90,169 +200,234 @@ def _refresh_ui(
                 )
             ]
 
-    lines = ms.log_buffer.get_lines()
-    log_text.value = "\n".join(lines) if lines else "Ready to download..."
-    page.update()
+    _schedule_update(session)
+
+
+_STATE_COLORS = {
+    "ACTIVE": ft.Colors.GREEN_400,
+    "PAUSED": ft.Colors.ORANGE_400,
+    "QUEUED": ft.Colors.BLUE_400,
+    "RETRYING": ft.Colors.YELLOW_400,
+    "COMPLETED": ft.Colors.GREEN_600,
+    "FAILED": ft.Colors.RED_400,
+}
+_IN_PROGRESS_STATES = frozenset({"ACTIVE", "QUEUED", "PAUSED"})
+
+# (action, tag) pairs whose mega-transfers call is still running; repeat clicks meanwhile are dropped.
+_actions_in_flight: set[tuple[str, str]] = set()
+
+
+def _on_transfer_action(session: _Session, e: ft.ControlEvent) -> None:
+    """Shared handler for a card's cancel/pause/resume buttons; the button carries (action, tag)."""
+    key = e.control.data
+    if key in _actions_in_flight:
+        return
+    _actions_in_flight.add(key)
+    e.control.disabled = True
+    _schedule_update(session)
+    session.page.run_task(_run_action_and_wake, session, e.control)
+
+
+def _build_single_card(session: _Session, tag: str) -> _TransferCard:
+    on_action = partial(_on_transfer_action, session)
+    cancel_btn = ft.IconButton(
+        icon=ft.Icons.CANCEL,
+        tooltip="Cancel",
+        data=("cancel", tag),
+        on_click=on_action,
+        icon_color=ft.Colors.RED_400,
+        icon_size=20,
+    )
+    pause_btn = ft.IconButton(
+        icon=ft.Icons.PAUSE,
+        tooltip="Pause",
+        data=("pause", tag),
+        on_click=on_action,
+        icon_color=ft.Colors.ORANGE_400,
+        icon_size=20,
+    )
+    resume_btn = ft.IconButton(
+        icon=ft.Icons.PLAY_ARROW,
+        tooltip="Resume",
+        data=("resume", tag),
+        on_click=on_action,
+        icon_color=ft.Colors.GREEN_400,
+        icon_size=20,
+    )
+
+    icon = ft.Icon(ft.Icons.CLOUD_DOWNLOAD, size=20)
+    filename_text = ft.Text(
+        "",
+        overflow=ft.TextOverflow.ELLIPSIS,
+        expand=True,
+        size=14,
+        weight=ft.FontWeight.W_500,
+    )
+    state_text = ft.Text("", size=11, weight=ft.FontWeight.BOLD)
+    state_badge = ft.Container(
+        content=state_text,
+        padding=ft.Padding.symmetric(horizontal=8, vertical=4),
+        border_radius=4,
+    )
+    progress_text = ft.Text("", size=12, color=ft.Colors.GREY_400)
+    progress_bar = ft.ProgressBar(value=0, bar_height=10, border_radius=5)
+
+    card = ft.Card(
+        content=ft.Container(
+            content=ft.Column(
+                [
+                    ft.Row(
+                        [icon, filename_text, state_badge],
+                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                        spacing=8,
+                    ),
+                    ft.Column(
+                        [
+                            ft.Row([progress_text]),
+                            progress_bar,
+                        ],
+                        spacing=4,
+                    ),
+                    ft.Row(
+                        [
+                            ft.Text(f"Tag: {tag}", size=10, color=ft.Colors.GREY_500),
+                            ft.Container(expand=True),
+                            resume_btn,
+                            pause_btn,
+                            cancel_btn,
+                        ],
+                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                    ),
+                ],
+                spacing=8,
+            ),
+            padding=14,
+        ),
+        elevation=2,
+    )
+    return _TransferCard(card, icon, filename_text, state_text, state_badge, progress_text, progress_bar)
+
+
+def _update_card(entry: _TransferCard, t: dict) -> None:
+    """Push a parsed transfer into its card, touching only properties whose inputs changed."""
+    pct = t["progress_pct"] / 100.0
+    state = t["state"]
+    entry.filename_text.value = t.get("filename", t.get("path", ""))
+
+    if state != entry.last_state:
+        entry.last_state = state
+        state_color = _STATE_COLORS.get(state, ft.Colors.GREY_400)
+        entry.icon.icon = ft.Icons.CLOUD_DOWNLOAD if state in _IN_PROGRESS_STATES else ft.Icons.CHECK_CIRCLE
+        entry.icon.color = state_color
+        entry.state_text.value = state
+        entry.state_text.color = state_color
+        entry.state_badge.bgcolor = ft.Colors.with_opacity(0.1, state_color)
+        entry.progress_bar.color = state_color if state == "ACTIVE" else ft.Colors.GREY_500
+        entry.progress_bar.bgcolor = ft.Colors.with_opacity(0.2, state_color)
+
+    pct_int = int(pct * 100)
+    if pct_int != entry.last_pct_int:
+        entry.last_pct_int = pct_int
+        size_display = t.get("size_display", "Unknown")
+        entry.progress_text.value = f"{pct_int}% of {size_display}" if size_display != "Unknown" else f"{pct_int}%"
+        entry.progress_bar.value = pct
 
 
-def _build_transfer_cards(
-    page: ft.Page,
-    log: ft.TextField,
-    transfers: list[dict],
-) -> list[ft.Control]:
+def _sync_transfer_cards(session: _Session, transfers: list[dict]) -> list[ft.Control]:
+    """Update cached cards in place, build cards for new tags and drop cards for tags that are gone."""
+    cards_by_tag = session.cards_by_tag
     cards: list[ft.Control] = []
+    seen: set[str] = set()
     for t in transfers:
         tag = str(t["tag"])
-        pct = t["progress_pct"] / 100.0
-        state = t["state"]
-        filename = t.get("filename", t.get("path", ""))
-        size_display = t.get("size_display", "Unknown")
+        entry = cards_by_tag.get(tag)
+        if entry is None:
+            entry = _build_single_card(session, tag)
+            cards_by_tag[tag] = entry
+        _update_card(entry, t)
+        seen.add(tag)
+        cards.append(entry.card)
+    for gone in cards_by_tag.keys() - seen:
+        del cards_by_tag[gone]
+    return cards
 
-        state_color = {
-            "ACTIVE": ft.Colors.GREEN_400,
-            "PAUSED": ft.Colors.ORANGE_400,
-            "QUEUED": ft.Colors.BLUE_400,
-            "RETRYING": ft.Colors.YELLOW_400,
-            "COMPLETED": ft.Colors.GREEN_600,
-            "FAILED": ft.Colors.RED_400,
-        }.get(state, ft.Colors.GREY_400)
-
-        progress_color = state_color if state == "ACTIVE" else ft.Colors.GREY_500
-
-        cancel_btn = ft.IconButton(
-            icon=ft.Icons.CANCEL,
-            tooltip="Cancel",
-            on_click=lambda e, tg=tag: page.run_task(ms.run_mega_transfers_action, "cancel", tg),
-            icon_color=ft.Colors.RED_400,
-            icon_size=20,
-        )
-        pause_btn = ft.IconButton(
-            icon=ft.Icons.PAUSE,
-            tooltip="Pause",
-            on_click=lambda e, tg=tag: page.run_task(ms.run_mega_transfers_action, "pause", tg),
-            icon_color=ft.Colors.ORANGE_400,
-            icon_size=20,
-        )
-        resume_btn = ft.IconButton(
-            icon=ft.Icons.PLAY_ARROW,
-            tooltip="Resume",
-            on_click=lambda e, tg=tag: page.run_task(ms.run_mega_transfers_action, "resume", tg),
-            icon_color=ft.Colors.GREEN_400,
-            icon_size=20,
-        )
 
-        progress_text = f"{int(pct * 100)}%"
-        if size_display != "Unknown":
-            progress_text = f"{int(pct * 100)}% of {size_display}"
-
-        card = ft.Card(
-            content=ft.Container(
-                content=ft.Column(
-                    [
-                        ft.Row(
-                            [
-                                ft.Icon(
-                                    ft.Icons.CLOUD_DOWNLOAD if state in ["ACTIVE", "QUEUED", "PAUSED"] else ft.Icons.CHECK_CIRCLE,
-                                    size=20,
-                                    color=state_color,
-                                ),
-                                ft.Text(
-                                    filename,
-                                    overflow=ft.TextOverflow.ELLIPSIS,
-                                    expand=True,
-                                    size=14,
-                                    weight=ft.FontWeight.W_500,
-                                ),
-                                ft.Container(
-                                    content=ft.Text(
-                                        state,
-                                        size=11,
-                                        weight=ft.FontWeight.BOLD,
-                                        color=state_color,
-                                    ),
-                                    bgcolor=ft.Colors.with_opacity(0.1, state_color),
-                                    padding=ft.Padding.symmetric(horizontal=8, vertical=4),
-                                    border_radius=4,
-                                ),
-                            ],
-                            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                            spacing=8,
-                        ),
-                        ft.Column(
-                            [
-                                ft.Row(
-                                    [
-                                        ft.Text(
-                                            progress_text,
-                                            size=12,
-                                            color=ft.Colors.GREY_400,
-                                        ),
-                                    ],
-                                ),
-                                ft.ProgressBar(
-                                    value=pct,
-                                    bar_height=10,
-                                    color=progress_color,
-                                    bgcolor=ft.Colors.with_opacity(0.2, state_color),
-                                    border_radius=5,
-                                ),
-                            ],
-                            spacing=4,
-                        ),
-                        ft.Row(
-                            [
-                                ft.Text(f"Tag: {tag}", size=10, color=ft.Colors.GREY_500),
-                                ft.Container(expand=True),
-                                resume_btn,
-                                pause_btn,
-                                cancel_btn,
-                            ],
-                            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                        ),
-                    ],
-                    spacing=8,
-                ),
-                padding=14,
-            ),
-            elevation=2,
-        )
-        cards.append(card)
-    return cards
+def _wake_pollers() -> None:
+    """Poll now instead of at the end of the current (possibly backed-off) interval, in every session."""
+    ms.clear_transfer_list_cache()
+    for session in list(_sessions):
+        session.poll_wake.set()
 
 
-async def poll_transfers(page: ft.Page, refresh_callback: callable | None = None) -> None:
-    global _transfer_list, _retrying_hint_shown
+async def _run_action_and_wake(session: _Session, button: ft.IconButton) -> None:
+    action, tag = button.data
+    try:
+        await ms.run_mega_transfers_action(action, tag)
+    finally:
+        _actions_in_flight.discard(button.data)
+        button.disabled = False
+        _schedule_update(session)
+    _wake_pollers()
+
+
+async def poll_transfers(session: _Session) -> None:
+    global _retrying_hint_shown
     poll_count = 0
+    interval = ms.POLL_INTERVAL
     while True:
+        started = time.monotonic()
+        changed = False
         try:
             out = await ms.get_transfer_list()
-            _transfer_list = out
-            if not _retrying_hint_shown and "RETRYING" in out:
-                _retrying_hint_shown = True
-                ms.log_buffer.append(
-                    "⚠ If transfers stay at 0% (RETRYING), try Resume, or Cancel and re-add the URL."
-                )
             poll_count += 1
-            if poll_count <= 5 or poll_count % 10 == 0:
+            # Idle or slow transfers often return a byte-identical table: skip re-parsing and re-rendering.
+            changed = out != session.transfer_list
+            if changed:
+                session.transfer_list = out
+                session.parsed_transfers = ms.parse_transfer_list(out)
+                if not _retrying_hint_shown and "RETRYING" in out:
+                    _retrying_hint_shown = True
+                    ms.log_buffer.append(
+                        "⚠ If transfers stay at 0% (RETRYING), try Resume, or Cancel and re-add the URL."
+                    )
+            if ms._DEBUG_LOG_ENABLED and (poll_count <= 5 or poll_count % 10 == 0):
                 ms._debug_log(
                     "main.py:poll_transfers",
                     "poll cycle complete",
-                    {"poll_count": poll_count, "transfers_found": len(ms.parse_transfer_list(out))},
+                    {"poll_count": poll_count, "transfers_found": len(session.parsed_transfers), "changed": changed},
                     hypothesis_id="H5",
                 )
-            if refresh_callback:
-                refresh_callback()
-            elif _refresh_ui_callback:
-                _refresh_ui_callback()
+            if changed:
+                _schedule_refresh(session)
         except Exception as e:
             ms.log_buffer.append(f"Poll error: {e}")
-            if _refresh_ui_callback:
-                _refresh_ui_callback()
-        await asyncio.sleep(ms.POLL_INTERVAL)
+        if ms.SIMULATE and poll_count:
+            # The simulated table is a constant: once it has been rendered there is nothing left to poll.
+            return
+        # Back off while nothing changes; any change or user action drops back to the base interval.
+        interval = ms.POLL_INTERVAL if changed else min(interval * 1.5, ms.POLL_INTERVAL_MAX)
+        # Count the mega-transfers run against the interval so a slow poll does not stretch the period.
+        try:
+            await asyncio.wait_for(
+                session.poll_wake.wait(), timeout=max(0.0, interval - (time.monotonic() - started))
+            )
+            interval = ms.POLL_INTERVAL
+        except TimeoutError:
+            pass
+        session.poll_wake.clear()
+
+
+def _close_session(session: _Session) -> None:
+    _sessions.discard(session)
+    if session.poll_task is not None:
+        session.poll_task.cancel()
+    if not _sessions:
+        # History saves are debounced: write a pending one before the app may exit with its last page.
+        ms.flush_pending_history()
 
 
 async def main(page: ft.Page) -> None:
-    global _refresh_ui_callback
+    session = _Session(page)
 
     page.title = "MEGA Get"
     page.theme_mode = ft.ThemeMode.DARK
@@ -281,8 +456,11 @@ async def main(page: ft.Page) -> None:
         ms.log_buffer.append("🧪 UI TEST MODE - Showing sample transfers for development")
         ms.log_buffer.append("ℹ Set UI_TEST_MODE=0 or remove env var to use real MEGAcmd")
 
-    server_ready = await ms.ensure_mega_cmd_server_running()
-    os.makedirs(ms.DOWNLOAD_DIR, exist_ok=True)
+    # Create the download dir in a worker thread while MEGAcmd starts; slow on network-mounted homes.
+    server_ready, _ = await asyncio.gather(
+        ms.ensure_mega_cmd_server_running(),
+        asyncio.to_thread(os.makedirs, ms.DOWNLOAD_DIR, exist_ok=True),
+    )
 
     if not server_ready and not ms.in_docker() and sys.platform == "darwin" and not ms.UI_TEST_MODE:
         ms.log_buffer.append("⚠ MEGAcmd server not detected. Open MEGAcmd from Applications, then restart this app.")
@@ -292,28 +470,30 @@ async def main(page: ft.Page) -> None:
     if ms.SIMULATE:
         ms.log_buffer.append("ℹ Simulation mode (MEGA_SIMULATE=1) - no MEGA CMD required.")
 
-    download_dir_abs = os.path.abspath(ms.DOWNLOAD_DIR)
-    subprocess_env = ms.subprocess_env()
-    path_for_resolve = subprocess_env.get("PATH", "")
-    mega_get_resolved = shutil.which("mega-get", path=path_for_resolve) if path_for_resolve else None
-    run_mode = "web" if ms.is_web_server_mode() else "desktop"
-    ms._debug_log(
-        "main.py:main:startup",
-        "DOWNLOAD_DIR, permissions, and local MEGAcmd (desktop)",
-        {
-            "run_mode": run_mode,
-            "DOWNLOAD_DIR": ms.DOWNLOAD_DIR,
-            "download_dir_abs": download_dir_abs,
-            "exists": os.path.isdir(ms.DOWNLOAD_DIR),
-            "writable": os.access(ms.DOWNLOAD_DIR, os.W_OK),
-            "cwd": os.getcwd(),
-            "MEGACMD_PATH": ms.MEGACMD_PATH or "(none)",
-            "mega_get_binary": mega_get_resolved or "(not found in PATH)",
-            "PATH_prefix": (path_for_resolve or "")[:200],
-            "server_ready": server_ready,
-        },
-        hypothesis_id="H1 H2 H4",
-    )
+    # Startup diagnostics stat the download dir and walk PATH; only pay for that when the debug log is on.
+    if ms._DEBUG_LOG_ENABLED:
+        download_dir_abs = ms.download_dir_abs()
+        subprocess_env = ms.subprocess_env()
+        path_for_resolve = subprocess_env.get("PATH", "")
+        mega_get_resolved = ms._which_cached("mega-get", path_for_resolve) if path_for_resolve else None
+        run_mode = "web" if ms.is_web_server_mode() else "desktop"
+        ms._debug_log(
+            "main.py:main:startup",
+            "DOWNLOAD_DIR, permissions, and local MEGAcmd (desktop)",
+            {
+                "run_mode": run_mode,
+                "DOWNLOAD_DIR": ms.DOWNLOAD_DIR,
+                "download_dir_abs": download_dir_abs,
+                "exists": os.path.isdir(ms.DOWNLOAD_DIR),
+                "writable": os.access(ms.DOWNLOAD_DIR, os.W_OK),
+                "cwd": os.getcwd(),
+                "MEGACMD_PATH": ms.MEGACMD_PATH or "(none)",
+                "mega_get_binary": mega_get_resolved or "(not found in PATH)",
+                "PATH_prefix": (path_for_resolve or "")[:200],
+                "server_ready": server_ready,
+            },
+            hypothesis_id="H1 H2 H4",
+        )
 
     url_field = ft.TextField(
         label="MEGA URL",
@@ -344,9 +524,9 @@ async def main(page: ft.Page) -> None:
         filled=True,
     )
 
-    transfers_container = ft.Column(
+    # ListView builds only the cards in view, so a long transfer list does not lay out every card per refresh.
+    transfers_container = ft.ListView(
         expand=True,
-        scroll=ft.ScrollMode.AUTO,
         spacing=12,
     )
 
@@ -356,66 +536,70 @@ async def main(page: ft.Page) -> None:
     )
 
     def do_refresh_ui() -> None:
-        _refresh_ui(page, transfers_container, log_text)
+        _refresh_ui(session, transfers_container, log_text)
         _refresh_history_ui(history_list_column, url_field)
 
-    global _refresh_ui_callback
-    _refresh_ui_callback = do_refresh_ui
-    ms.set_log_notify(do_refresh_ui)
+    session.refresh = do_refresh_ui
+    _sessions.add(session)
+    page.on_close = lambda _e: _close_session(session)
+    ms.set_log_notify(_notify_sessions)
 
     async def on_get(_: ft.ControlEvent) -> None:
         url = url_field.value
         if not (url and url.strip()):
             ms.log_buffer.append("⚠ Please enter a MEGA URL")
-            do_refresh_ui()
             return
         url = url.strip()
         ms.add_url_to_history(url)
         url_field.value = ""
-        page.update()
-        await ms.run_mega_get(url)
-        do_refresh_ui()
+        _schedule_update(session)
+        # The poller's last parse is the "before" tag set: no extra mega-transfers run ahead of mega-get.
+        await ms.run_mega_get(url, {str(t["tag"]) for t in session.parsed_transfers})
+        _wake_pollers()
+        _schedule_refresh(session)
 
     get_btn.on_click = on_get
 
     def clear_history_local(_e: ft.ControlEvent) -> None:
         ms.clear_history()
         _refresh_history_ui(history_list_column, url_field)
-        page.update()
+
+    clear_history_row = ft.Container(
+        content=ft.TextButton(
+            "Clear history",
+            icon=ft.Icons.DELETE_SWEEP,
+            on_click=clear_history_local,
+        ),
+        padding=ft.Padding.only(top=8),
+    )
+
+    def on_history_click(e: ft.ControlEvent) -> None:
+        url_field.value = e.control.data
+        _schedule_update(session)
 
     def _refresh_history_ui(history_col: ft.Column, url_f: ft.TextField) -> None:
-        history_col.controls.clear()
-        for u in ms.get_history()[:30]:
-            def make_click(link: str):
-                def handler(e: ft.ControlEvent) -> None:
-                    url_f.value = link
-                    page.update()
-
-                return handler
-
-            tile = ft.ListTile(
-                leading=ft.Icon(ft.Icons.HISTORY, size=16),
-                title=ft.Text(
-                    u[:60] + "..." if len(u) > 60 else u,
-                    overflow=ft.TextOverflow.ELLIPSIS,
-                    size=11,
-                ),
-                on_click=make_click(u),
-                dense=True,
-            )
-            history_col.controls.append(tile)
-        if ms.get_history():
-            history_col.controls.append(
-                ft.Container(
-                    content=ft.TextButton(
-                        "Clear history",
-                        icon=ft.Icons.DELETE_SWEEP,
-                        on_click=clear_history_local,
-                    ),
-                    padding=ft.Padding.only(top=8),
+        urls = ms.get_history()[:30]
+        if urls == session.history_shown:
+            return
+        session.history_shown = urls
+
+        tiles = session.history_tiles
+        while len(tiles) < len(urls):
+            tiles.append(
+                ft.ListTile(
+                    leading=ft.Icon(ft.Icons.HISTORY, size=16),
+                    title=ft.Text("", overflow=ft.TextOverflow.ELLIPSIS, size=11),
+                    on_click=on_history_click,
+                    dense=True,
                 )
             )
-        page.update()
+        del tiles[len(urls) :]
+        for tile, u in zip(tiles, urls):
+            if tile.data != u:
+                tile.data = u
+                tile.title.value = u[:60] + "..." if len(u) > 60 else u
+        history_col.controls = [*tiles, clear_history_row] if urls else list(tiles)
+        _schedule_update(session)
 
     add_url_section = ft.Container(
         content=ft.Column(
@@ -508,7 +692,7 @@ async def main(page: ft.Page) -> None:
     )
 
     do_refresh_ui()
-    page.run_task(poll_transfers, page, do_refresh_ui)
+    session.poll_task = page.run_task(poll_transfers, session)
 
 
 if __name__ == "__main__":
@@ -517,3 +701,4 @@ if __name__ == "__main__":
         ft.run(main, view=ft.AppView.FLET_APP_WEB, port=port)
     else:
         ft.run(main)
+    ms.flush_pending_history()